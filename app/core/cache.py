@@ -0,0 +1,121 @@
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class MemoryCache(CacheBackend):
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    def __init__(self, url: str, namespace: str, ttl: float):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND_URL requires the 'redis' package to be installed")
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.ttl = ttl
+        self._errors = (redis.RedisError,)
+
+    def _key(self, key: str) -> str:
+        return f"{settings.CACHE_KEY_PREFIX}:{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(self._key(key))
+        except self._errors:
+            logger.warning("Cache backend unavailable, treating %s as a miss", key, exc_info=True)
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        try:
+            self.client.set(self._key(key), json.dumps(value), px=int(ttl * 1000))
+        except self._errors:
+            logger.warning("Cache backend unavailable, could not store %s", key, exc_info=True)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self._key(key))
+        except self._errors:
+            logger.warning("Cache backend unavailable, could not invalidate %s", key, exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            for key in self.client.scan_iter(match=self._key("*")):
+                self.client.delete(key)
+        except self._errors:
+            logger.warning("Cache backend unavailable, could not clear %s", self.namespace, exc_info=True)
+
+
+def create_cache(namespace: str, max_size: int, ttl: float) -> CacheBackend:
+    if settings.CACHE_BACKEND_URL:
+        return RedisCache(settings.CACHE_BACKEND_URL, namespace, ttl)
+    return MemoryCache(max_size, ttl)
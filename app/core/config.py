@@ -1,3 +1,5 @@
+from typing import Dict, Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,6 +8,67 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    DEBUG: bool = False
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
+    DATABASE_ASYNC: bool = False
+    THREADPOOL_SIZE: Optional[int] = None
+
+    DB_SSLMODE: Optional[str] = "require"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    SLOW_QUERY_MS: float = 200
+    SLOW_REQUEST_MS: float = 1000
+    SLOW_REQUEST_QUERIES: int = 50
+
+    CACHE_BACKEND_URL: Optional[str] = None
+    CACHE_KEY_PREFIX: str = "budget"
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    REVOKED_TOKEN_CACHE_MAX_SIZE: int = 100000
+    ACTIVE_TOKEN_FAMILY_CACHE_TTL_SECONDS: float = 30
+    DATA_VERSION_CACHE_TTL_SECONDS: float = 0
+    DATA_VERSION_CACHE_MAX_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: float = 300
+    RESPONSE_CACHE_MAX_SIZE: int = 0
+    BALANCE_SUMMARY_CACHE_TTL_SECONDS: float = 0
+    BALANCE_SUMMARY_CACHE_MAX_SIZE: int = 10000
+
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_USER: str = "300/minute"
+    RATE_LIMIT_PER_IP: str = "300/minute"
+    RATE_LIMIT_RULES: Dict[str, str] = {
+        "/health": "none",
+        "/metrics": "none",
+        "POST /auth/login": "20/minute",
+        "POST /auth/register": "10/minute",
+        "POST /operations/import": "10/minute",
+        "GET /operations/export": "10/minute",
+    }
+    RATE_LIMIT_MAX_BUCKETS: int = 100000
+
+    OPERATION_BATCH_MAX_SIZE: int = 500
+
+    BASE_CURRENCY: str = "KGS"
+    EXCHANGE_RATES_FILE: Optional[str] = None
+    EXCHANGE_RATE_CACHE_TTL_SECONDS: float = 300
+    ADMIN_API_KEY: Optional[str] = None
+
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5
+
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
     
     class Config:
         env_file = ".env"
@@ -1,22 +1,117 @@
-from sqlalchemy import create_engine
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url, URL
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.metrics import Gauge, db_pool_timeouts, db_pool_wait_seconds
+
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            db_pool_timeouts.inc()
+            raise
+        finally:
+            db_pool_wait_seconds.observe(time.perf_counter() - started)
+
+
+def get_pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def get_connect_args(url: URL, is_async: bool = False) -> dict:
+    if url.get_backend_name() != "postgresql" or not settings.DB_SSLMODE:
+        return {}
+    return {"ssl": settings.DB_SSLMODE} if is_async else {"sslmode": settings.DB_SSLMODE}
 
-engine = create_engine(settings.DATABASE_URL,
-                       pool_pre_ping=True,
-                       connect_args={"sslmode": "require"},)
+
+database_url = make_url(settings.DATABASE_URL)
+
+engine = create_engine(database_url,
+                       poolclass=InstrumentedQueuePool,
+                       connect_args=get_connect_args(database_url),
+                       **get_pool_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+Gauge("db_pool_size", "Configured connection pool size", callback=lambda: engine.pool.size())
+Gauge("db_pool_checked_out", "Connections currently checked out", callback=lambda: engine.pool.checkedout())
+Gauge("db_pool_checked_in", "Idle connections in the pool", callback=lambda: engine.pool.checkedin())
+Gauge("db_pool_overflow", "Overflow connections currently open", callback=lambda: max(engine.pool.overflow(), 0))
+
 Base = declarative_base()
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_url(database_url: URL) -> URL:
+    return database_url.set(
+        drivername=ASYNC_DRIVERS.get(database_url.get_backend_name(), database_url.drivername)
+    ).difference_update_query(["sslmode"])
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    try:
+        async_engine = create_async_engine(get_async_url(database_url),
+                                           connect_args=get_connect_args(database_url, is_async=True),
+                                           **get_pool_options())
+    except ImportError:
+        raise RuntimeError("DATABASE_ASYNC requires the 'async' extra (asyncpg or aiosqlite) to be installed")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
-        
-def init_db():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+
+
+@contextmanager
+def unit_of_work(db: Session):
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pool_status() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeouts": db_pool_timeouts.value,
+        "wait_seconds": db_pool_wait_seconds.snapshot(),
+    }
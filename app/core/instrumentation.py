@@ -0,0 +1,155 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import (
+    db_queries_per_request,
+    db_query_seconds,
+    db_time_per_request_seconds,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_requests_total,
+    maybe_write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+SLOWEST_QUERY_HEADER = "X-DB-Slowest-Ms"
+MAX_LOGGED_STATEMENT = 500
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+
+# Handlers run in worker threads with a copy of the request context, so the
+# middleware shares one mutable stats object rather than setting values per query.
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_query_seconds.observe(elapsed)
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement[:MAX_LOGGED_STATEMENT])
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = MutableHeaders(scope=message)
+                headers[QUERY_COUNT_HEADER] = str(stats.count)
+                headers[QUERY_TIME_HEADER] = f"{stats.total_seconds * 1000:.2f}"
+                headers[SLOWEST_QUERY_HEADER] = f"{stats.slowest_seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            db_queries_per_request.observe(stats.count)
+            db_time_per_request_seconds.observe(stats.total_seconds)
+
+            if elapsed * 1000 >= settings.SLOW_REQUEST_MS or stats.count >= settings.SLOW_REQUEST_QUERIES:
+                route = scope.get("route")
+                logger.warning(
+                    "Slow request %s %s: %.1f ms, %d queries, %.1f ms in DB, slowest %.1f ms: %s",
+                    scope["method"],
+                    route.path if route else scope["path"],
+                    elapsed * 1000,
+                    stats.count,
+                    stats.total_seconds * 1000,
+                    stats.slowest_seconds * 1000,
+                    (stats.slowest_statement or "")[:MAX_LOGGED_STATEMENT],
+                )
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        http_requests_in_progress.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_progress.dec()
+            # Label by route template, never the raw path, so ids in URLs and
+            # unmatched paths cannot blow up the number of series.
+            route = scope.get("route")
+            path = route.path if route else UNMATCHED_ROUTE
+            http_request_duration_seconds.labels(scope["method"], path).observe(time.perf_counter() - started)
+            http_requests_total.labels(scope["method"], path, status_code).inc()
+            maybe_write_snapshot(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+
+
+def get_query_stats() -> dict:
+    return {
+        "query_seconds": db_query_seconds.snapshot(),
+        "queries_per_request": db_queries_per_request.snapshot(),
+        "db_seconds_per_request": db_time_per_request_seconds.snapshot(),
+    }
@@ -0,0 +1,319 @@
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+PASSWORD_HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List["Metric"] = []
+
+    def register(self, metric: "Metric") -> None:
+        self.metrics.append(metric)
+
+    def collect(self) -> List[dict]:
+        return [metric.collect() for metric in self.metrics]
+
+
+REGISTRY = Registry()
+
+
+class _CounterValue:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def state(self) -> float:
+        return self.value
+
+
+class _GaugeValue(_CounterValue):
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def state(self) -> dict:
+        with self._lock:
+            return {"counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+    def snapshot(self) -> Dict:
+        state = self.state()
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip(self.buckets, state["counts"]):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = state["count"]
+        return {"count": state["count"], "sum": state["sum"], "buckets": buckets}
+
+
+class Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        registry.register(self)
+
+    @abstractmethod
+    def _new_child(self):
+        ...
+
+    def labels(self, *values) -> object:
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[Tuple[Tuple[str, ...], object]]:
+        return [(key, child.state()) for key, child in list(self._children.items())]
+
+    def collect(self) -> dict:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(key), state] for key, state in self._samples()],
+        }
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def _new_child(self):
+        return _CounterValue()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    @property
+    def value(self) -> float:
+        return self._children[()].value
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, *args, callback: Optional[Callable[[], float]] = None, **kwargs):
+        self.callback = callback
+        super().__init__(*args, **kwargs)
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def _samples(self):
+        if self.callback is not None:
+            return [((), float(self.callback()))]
+        return super()._samples()
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].dec(amount)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **kwargs):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(*args, **kwargs)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def collect(self) -> dict:
+        family = super().collect()
+        family["buckets"] = list(self.buckets)
+        return family
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def snapshot(self) -> Dict:
+        return self._children[()].snapshot()
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def render(families: List[dict]) -> str:
+    lines = []
+    for family in families:
+        name, labelnames = family["name"], family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, state in family["samples"]:
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(state)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(family["buckets"] + [float("inf")], state["counts"]):
+                cumulative += count
+                le = ("le", "+Inf" if bound == float("inf") else _format_value(bound))
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(state['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {state['count']}")
+    return "\n".join(lines) + "\n"
+
+
+# Multi-process servers (gunicorn/uvicorn --workers) each keep their own
+# registry; every worker periodically writes a snapshot to a shared directory
+# and a scrape served by any worker merges all of them.
+_last_flush = 0.0
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def write_snapshot(directory: str, registry: Registry = REGISTRY) -> None:
+    global _last_flush
+    path = _snapshot_path(directory, os.getpid())
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(registry.collect(), f)
+    os.replace(tmp_path, path)
+    _last_flush = time.monotonic()
+
+
+def maybe_write_snapshot(directory: Optional[str], interval: float) -> None:
+    if directory and time.monotonic() - _last_flush >= interval:
+        write_snapshot(directory)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(directory: str) -> List[dict]:
+    merged: Dict[str, dict] = {}
+    for path in sorted(glob.glob(os.path.join(directory, "metrics-*.json"))):
+        pid = int(os.path.basename(path)[len("metrics-"):-len(".json")])
+        alive = _pid_alive(pid)
+        try:
+            with open(path) as f:
+                families = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        for family in families:
+            # Counters and histograms of exited workers still count towards
+            # the totals; their gauges describe state that no longer exists.
+            if family["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(family["name"], {**family, "samples": {}})
+            for labels, state in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = state
+                elif family["type"] == "histogram":
+                    target["samples"][key] = {
+                        "counts": [a + b for a, b in zip(current["counts"], state["counts"])],
+                        "sum": current["sum"] + state["sum"],
+                        "count": current["count"] + state["count"],
+                    }
+                else:
+                    target["samples"][key] = current + state
+
+    return [
+        {**family, "samples": [[list(key), state] for key, state in family["samples"].items()]}
+        for family in merged.values()
+    ]
+
+
+def generate_latest(directory: Optional[str] = None) -> str:
+    if not directory:
+        return render(REGISTRY.collect())
+    write_snapshot(directory)
+    return render(merge_snapshots(directory))
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code",
+    ["method", "route", "status"],
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template",
+    ["method", "route"],
+)
+http_requests_in_progress = Gauge("http_requests_in_progress", "HTTP requests currently being served")
+
+db_pool_wait_seconds = Histogram("db_pool_wait_seconds", "Time spent waiting for a pooled connection")
+db_pool_timeouts = Counter("db_pool_timeouts_total", "Connection checkouts that timed out")
+db_query_seconds = Histogram("db_query_seconds", "SQL statement execution time")
+db_queries_per_request = Histogram(
+    "db_queries_per_request", "SQL statements issued per HTTP request", buckets=QUERY_COUNT_BUCKETS,
+)
+db_time_per_request_seconds = Histogram("db_time_per_request_seconds", "Time spent in SQL per HTTP request")
+
+password_hash_seconds = Histogram(
+    "password_hash_seconds", "Password hashing and verification time", ["operation"],
+    buckets=PASSWORD_HASH_BUCKETS,
+)
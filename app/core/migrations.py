@@ -0,0 +1,97 @@
+import logging
+from datetime import datetime
+from types import ModuleType
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LOCK_ID = 724501
+
+metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("revision", String, primary_key=True),
+    Column("description", String, nullable=True),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+def _acquire_lock(connection: Connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+
+def _release_lock(connection: Connection) -> None:
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+
+# A failed or interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index
+# behind, which checkfirst and IF NOT EXISTS take as already built. Dropping it
+# first makes rerunning the migration rebuild the index.
+def drop_invalid_index(connection: Connection, name: str) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    invalid = connection.execute(text(
+        "SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        logger.warning("Dropping invalid index %s left by an interrupted build", name)
+        connection.execute(text(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {connection.dialect.identifier_preparer.quote(name)}"
+        ))
+
+
+def get_applied_revisions(engine: Engine) -> List[str]:
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        return list(connection.execute(
+            select(schema_migrations.c.revision).order_by(schema_migrations.c.revision)
+        ).scalars())
+
+
+def _apply(engine: Engine, migration: ModuleType) -> None:
+    if getattr(migration, "transactional", True):
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_migrations.insert().values(
+                revision=migration.revision,
+                description=migration.description,
+            ))
+        return
+
+    with engine.connect() as connection:
+        migration.upgrade(connection.execution_options(isolation_level="AUTOCOMMIT"))
+    with engine.begin() as connection:
+        connection.execute(schema_migrations.insert().values(
+            revision=migration.revision,
+            description=migration.description,
+        ))
+
+
+def run_migrations(engine: Engine, migrations: Optional[Sequence[ModuleType]] = None) -> List[str]:
+    if migrations is None:
+        from app.migrations import MIGRATIONS
+        migrations = MIGRATIONS
+
+    applied = []
+    with engine.connect() as lock_connection:
+        _acquire_lock(lock_connection)
+        try:
+            done = set(get_applied_revisions(engine))
+            for migration in migrations:
+                if migration.revision in done:
+                    continue
+                logger.info("Applying migration %s: %s", migration.revision, migration.description)
+                _apply(engine, migration)
+                applied.append(migration.revision)
+        finally:
+            _release_lock(lock_connection)
+    return applied
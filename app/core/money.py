@@ -0,0 +1,58 @@
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Annotated, Any, Optional, Union
+
+from pydantic import AfterValidator, Field, PlainSerializer
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+MINOR_UNIT_DIGITS = 2
+MONEY_PRECISION = 18
+CENT = Decimal(1).scaleb(-MINOR_UNIT_DIGITS)
+# Largest amount with MONEY_PRECISION digits; as minor units it fits a BIGINT
+# column with room to spare.
+MAX_AMOUNT = Decimal(10).scaleb(MONEY_PRECISION - MINOR_UNIT_DIGITS - 1) - CENT
+
+
+def quantize(value: Union[Decimal, float, int, str]) -> Decimal:
+    # str() keeps floats at their shortest repr (0.1 -> 0.1, not 0.1000000000000000055...).
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    try:
+        return value.quantize(CENT, rounding=ROUND_HALF_EVEN)
+    except InvalidOperation:
+        raise ValueError(f"Amount {value} cannot be represented in minor units")
+
+
+def to_minor_units(value: Union[Decimal, float, int, str]) -> int:
+    return int(quantize(value).scaleb(MINOR_UNIT_DIGITS))
+
+
+def from_minor_units(value: Union[int, float, Decimal]) -> Decimal:
+    return Decimal(int(value)).scaleb(-MINOR_UNIT_DIGITS)
+
+
+# Amounts are stored as integer minor units and read back as exact Decimals;
+# SUM() over the column is integer arithmetic and comes back as Decimal too.
+class MoneyType(TypeDecorator):
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return to_minor_units(value)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return from_minor_units(value)
+
+
+# Accepts any JSON number within +/-MAX_AMOUNT, rounds it to the minor unit and
+# keeps emitting JSON numbers, so clients see the same wire format as before.
+Money = Annotated[
+    Decimal,
+    Field(ge=-MAX_AMOUNT, le=MAX_AMOUNT),
+    AfterValidator(quantize),
+    PlainSerializer(float, return_type=float, when_used="json"),
+]
@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def encode_cursor(operation_date: datetime, operation_id: int) -> str:
+    return _encode([operation_date.isoformat(), operation_id])
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        operation_date, operation_id = _decode(cursor)
+        return datetime.fromisoformat(operation_date), int(operation_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+
+
+def encode_rank_cursor(rank: float, operation_id: int) -> str:
+    return _encode([rank, operation_id])
+
+
+def decode_rank_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    if not cursor:
+        return None
+    try:
+        rank, operation_id = _decode(cursor)
+        return float(rank), int(operation_id)
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
@@ -0,0 +1,205 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from jose import JWTError, jwt
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+UNLIMITED = "none"
+REFRESH_TOKEN_TYPE = "refresh"
+
+rate_limited_requests = Counter(
+    "rate_limited_requests_total", "Requests rejected with 429 by rate limit rule", ["rule"],
+)
+
+# Token bucket in Redis: refilled from the time elapsed since the last request,
+# one token taken per request. Returns the seconds to wait as a string, since
+# Lua numbers are truncated to integers in replies.
+TOKEN_BUCKET_SCRIPT = """
+redis.replicate_commands()
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RateLimit:
+    def __init__(self, count: int, period: float):
+        self.capacity = count
+        self.refill_per_second = count / period
+
+    @classmethod
+    def parse(cls, value: str) -> Optional["RateLimit"]:
+        if value.strip().lower() == UNLIMITED:
+            return None
+        count, _, period = value.partition("/")
+        try:
+            limit = cls(int(count), PERIODS[period.strip().lower()])
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid rate limit {value!r}, expected e.g. '100/minute' or 'none'")
+        if limit.capacity <= 0:
+            raise ValueError(f"Invalid rate limit {value!r}, the count must be positive")
+        return limit
+
+
+class RateLimitRule:
+    def __init__(self, pattern: str, limit: Optional[RateLimit]):
+        method, _, path = pattern.strip().rpartition(" ")
+        self.name = pattern.strip()
+        self.method = method.upper() or None
+        self.prefix = path
+        self.limit = limit
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and path.startswith(self.prefix)
+
+
+def parse_rules(rules: Dict[str, str]) -> List[RateLimitRule]:
+    parsed = [RateLimitRule(pattern, RateLimit.parse(limit)) for pattern, limit in rules.items()]
+    # Longest prefix wins; at equal length a method-specific rule beats a bare path.
+    return sorted(parsed, key=lambda rule: (len(rule.prefix), rule.method is not None), reverse=True)
+
+
+class MemoryBuckets:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    # Only called from the event loop and never awaits in between, so the
+    # read-modify-write needs no lock. An evicted bucket starts full again;
+    # the least recently used ones have usually refilled anyway.
+    async def acquire(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / limit.refill_per_second
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_size:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisBuckets:
+    def __init__(self, url: str):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND_URL requires the 'redis' package to be installed")
+        self.client = redis.asyncio.Redis.from_url(url)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._errors = (redis.RedisError,)
+
+    async def acquire(self, key: str, limit: RateLimit) -> float:
+        try:
+            wait = await self.script(
+                keys=[f"{settings.CACHE_KEY_PREFIX}:rate-limit:{key}"],
+                args=[limit.capacity, limit.refill_per_second],
+            )
+        except self._errors:
+            logger.warning("Rate limit backend unavailable, letting %s through", key, exc_info=True)
+            return 0.0
+        return float(wait)
+
+
+def create_buckets():
+    if settings.CACHE_BACKEND_URL:
+        return RedisBuckets(settings.CACHE_BACKEND_URL)
+    return MemoryBuckets(settings.RATE_LIMIT_MAX_BUCKETS)
+
+
+def _access_token_claims(scope) -> Optional[dict]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            try:
+                claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            except JWTError:
+                return None
+            if claims.get("type") == REFRESH_TOKEN_TYPE or not claims.get("sub"):
+                return None
+            return claims
+    return None
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, is_revoked: Optional[Callable[[str], Awaitable[bool]]] = None):
+        self.app = app
+        self.is_revoked = is_revoked
+        self.rules = parse_rules(settings.RATE_LIMIT_RULES)
+        self.user_limit = RateLimit.parse(settings.RATE_LIMIT_PER_USER)
+        self.ip_limit = RateLimit.parse(settings.RATE_LIMIT_PER_IP)
+        self.buckets = create_buckets()
+
+    # Only a usable access token picks the user's bucket, so forged, refresh
+    # and revoked tokens cannot spend a user's budget; they are limited by
+    # address instead.
+    async def _user_id(self, scope) -> Optional[str]:
+        claims = _access_token_claims(scope)
+        if claims is None:
+            return None
+        family_id = claims.get("fam")
+        if family_id and self.is_revoked is not None and await self.is_revoked(family_id):
+            return None
+        return str(claims["sub"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user_id = await self._user_id(scope)
+        if user_id is not None:
+            identity, name, limit = f"user:{user_id}", "user", self.user_limit
+        else:
+            client = scope.get("client")
+            identity, name, limit = f"ip:{client[0] if client else 'unknown'}", "ip", self.ip_limit
+        for rule in self.rules:
+            if rule.matches(scope["method"], scope["path"]):
+                name, limit = rule.name, rule.limit
+                break
+
+        if limit is not None:
+            wait = await self.buckets.acquire(f"{name}:{identity}", limit)
+            if wait > 0:
+                rate_limited_requests.labels(name).inc()
+                response = JSONResponse(
+                    {"detail": "Too many requests, try again later"},
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,47 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Union
+
+from sqlalchemy import func
+from sqlalchemy.sql import ColumnElement
+
+DATE_BUCKETS = ("day", "week", "month")
+
+
+def date_trunc(bucket: str, column, dialect_name: str) -> ColumnElement:
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket, column)
+    if dialect_name == "sqlite":
+        if bucket == "day":
+            return func.date(column)
+        if bucket == "week":
+            return func.date(column, "weekday 0", "-6 days")
+        if bucket == "month":
+            return func.strftime("%Y-%m-01", column)
+    raise NotImplementedError(f"date_trunc({bucket!r}) is not supported on {dialect_name}")
+
+
+def to_date(value: Union[str, date, datetime]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def month_start(value: Union[date, datetime]) -> date:
+    return date(value.year, value.month, 1)
+
+
+def day_after(value: date) -> date:
+    return value + timedelta(days=1)
+
+
+# end_date is inclusive of the whole day: operation_date is a timestamp, so
+# "<= end_date" would stop at the end day's midnight.
+def date_range_filters(column, start_date: Optional[date], end_date: Optional[date]) -> List[ColumnElement]:
+    filters = []
+    if start_date:
+        filters.append(column >= start_date)
+    if end_date:
+        filters.append(column < day_after(end_date))
+    return filters
@@ -0,0 +1,36 @@
+import argparse
+import logging
+import sys
+
+from app.services.reconciliation import RECONCILE_JOB, run_reconciliation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute account balances from their operations")
+    parser.add_argument("--fix", action="store_true", help="write the recomputed balance to drifted accounts")
+    parser.add_argument("--workers", type=int, default=4, help="user chunks processed in parallel")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="user ids per chunk")
+    parser.add_argument("--batch-size", type=int, default=500, help="user ids per transaction and checkpoint")
+    parser.add_argument("--job", default=RECONCILE_JOB, help="checkpoint name, to run independent jobs side by side")
+    parser.add_argument("--restart", action="store_true", help="ignore checkpoints of an interrupted run")
+    parser.add_argument("--show", type=int, default=50, help="discrepancies to list")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    report = run_reconciliation(args.job, args.fix, args.workers, args.chunk_size, args.batch_size, args.restart)
+    for discrepancy in report.found[:args.show]:
+        action = "fixed" if discrepancy.fixed else ("changed concurrently, skipped" if args.fix else "reported")
+        print(
+            f"account {discrepancy.account_id} (user {discrepancy.user_id}): "
+            f"stored {discrepancy.stored} expected {discrepancy.expected} [{action}]"
+        )
+    print(
+        f"{report.job}: {report.accounts_checked} account(s) in {report.chunks} chunk(s), "
+        f"{report.discrepancies} discrepancy(ies), {report.fixed} fixed"
+    )
+    sys.exit(1 if report.discrepancies > report.fixed else 0)
+
+
+if __name__ == "__main__":
+    main()
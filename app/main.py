@@ -1,8 +1,27 @@
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.core.database import init_db
-from app.routes import auth, users, accounts, categories, operations
+from app.core.config import settings
+from app.core.database import SessionLocal, async_engine, engine, get_pool_status
+from app.core.hashing import password_hasher
+from app.core.instrumentation import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    SLOWEST_QUERY_HEADER,
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    get_query_stats,
+    install_query_instrumentation,
+)
+from app.core.metrics import CONTENT_TYPE, generate_latest
+from app.core.migrations import run_migrations
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.rate_limit import RateLimitMiddleware
+from app.routes import admin, auth, users, accounts, categories, operations, reports
+from app.services.auth import is_family_revoked
+from app.services.exchange_rate import ExchangeRateService, load_rates_file
 
 app = FastAPI(
     title="Budget App",
@@ -10,23 +29,57 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Added first so it sits inside CORS and the metrics middleware: 429s still
+# carry CORS headers and are counted.
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, is_revoked=is_family_revoked)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER, SLOWEST_QUERY_HEADER, "Retry-After"],
 )
+app.add_middleware(QueryStatsMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+install_query_instrumentation(engine)
+if async_engine is not None:
+    install_query_instrumentation(async_engine.sync_engine)
+
+@app.on_event("startup")
+async def configure_threadpool():
+    if settings.THREADPOOL_SIZE:
+        to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
 
 @app.on_event("startup")
 def startup_event():
-    init_db()
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        run_migrations(engine)
+    if settings.EXCHANGE_RATES_FILE:
+        db = SessionLocal()
+        try:
+            ExchangeRateService(db).set_rates(load_rates_file(settings.EXCHANGE_RATES_FILE))
+        finally:
+            db.close()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(accounts.router)
 app.include_router(categories.router)
 app.include_router(operations.router)
+app.include_router(reports.router)
+app.include_router(admin.router)
 
 @app.get("/")
 def root():
@@ -34,4 +87,19 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/health/db-pool")
+def db_pool_status():
+    return get_pool_status()
+
+
+@app.get("/health/db-queries")
+def db_query_status():
+    return get_query_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(generate_latest(settings.METRICS_MULTIPROC_DIR), media_type=CONTENT_TYPE)
@@ -0,0 +1,27 @@
+from app.migrations import (
+    m0001_initial,
+    m0002_hot_filter_indexes,
+    m0003_category_monthly_totals,
+    m0004_refresh_tokens,
+    m0005_user_data_version,
+    m0006_operation_search,
+    m0007_money_minor_units,
+    m0008_balance_reconciliation,
+    m0009_exchange_rates,
+    m0010_rebuild_invalid_indexes,
+)
+
+MIGRATIONS = [
+    m0001_initial,
+    m0002_hot_filter_indexes,
+    m0003_category_monthly_totals,
+    m0004_refresh_tokens,
+    m0005_user_data_version,
+    m0006_operation_search,
+    m0007_money_minor_units,
+    m0008_balance_reconciliation,
+    m0009_exchange_rates,
+    m0010_rebuild_invalid_indexes,
+]
+
+__all__ = ["MIGRATIONS"]
@@ -0,0 +1,28 @@
+import argparse
+import logging
+
+from app.core.database import engine
+from app.core.migrations import get_applied_revisions, run_migrations
+from app.migrations import MIGRATIONS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("command", choices=["upgrade", "status"], nargs="?", default="upgrade")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.command == "status":
+        applied = set(get_applied_revisions(engine))
+        for migration in MIGRATIONS:
+            state = "applied" if migration.revision in applied else "pending"
+            print(f"{migration.revision}  {state:<8} {migration.description}")
+        return
+
+    applied = run_migrations(engine)
+    print(f"Applied {len(applied)} migration(s)" + (f": {', '.join(applied)}" if applied else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, DateTime
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import drop_invalid_index
+
+revision = "0002"
+description = "Composite indexes for operation, account and category filters"
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+transactional = False
+
+metadata = MetaData()
+
+operations = Table(
+    "operations",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("account_id", Integer),
+    Column("category_id", Integer),
+    Column("operation_date", DateTime),
+)
+
+accounts = Table(
+    "accounts",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+)
+
+categories = Table(
+    "categories",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("type", String),
+)
+
+indexes = [
+    Index(
+        "ix_operations_user_date_id",
+        operations.c.user_id,
+        operations.c.operation_date.desc(),
+        operations.c.id.desc(),
+        postgresql_concurrently=True,
+    ),
+    Index(
+        "ix_operations_user_account_date",
+        operations.c.user_id,
+        operations.c.account_id,
+        operations.c.operation_date,
+        postgresql_concurrently=True,
+    ),
+    Index(
+        "ix_operations_user_category",
+        operations.c.user_id,
+        operations.c.category_id,
+        postgresql_concurrently=True,
+    ),
+    Index("ix_accounts_user_id", accounts.c.user_id, postgresql_concurrently=True),
+    Index("ix_categories_user_type", categories.c.user_id, categories.c.type, postgresql_concurrently=True),
+]
+
+
+def upgrade(connection: Connection) -> None:
+    for index in indexes:
+        drop_invalid_index(connection, index.name)
+        index.create(connection, checkfirst=True)
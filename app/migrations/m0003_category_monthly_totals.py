@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+revision = "0003"
+description = "Per user, category and month operation totals"
+
+metadata = MetaData()
+
+category_monthly_totals = Table(
+    "category_monthly_totals",
+    metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True),
+    Column("month", Date, primary_key=True),
+    Column("total_amount", Float, nullable=False, default=0.0),
+    Column("operations_count", Integer, nullable=False, default=0),
+)
+
+MONTH_EXPRESSIONS = {
+    "postgresql": "CAST(date_trunc('month', operation_date) AS DATE)",
+    "sqlite": "strftime('%Y-%m-01', operation_date)",
+}
+
+
+def backfill(connection: Connection) -> None:
+    month = MONTH_EXPRESSIONS[connection.dialect.name]
+    connection.execute(text(f"""
+        INSERT INTO category_monthly_totals (user_id, category_id, month, total_amount, operations_count)
+        SELECT user_id, category_id, {month}, SUM(amount), COUNT(*)
+        FROM operations
+        GROUP BY user_id, category_id, {month}
+    """))
+
+
+def upgrade(connection: Connection) -> None:
+    # The users/categories tables are reflected so the foreign keys resolve.
+    metadata.reflect(connection, only=["users", "categories"])
+    category_monthly_totals.create(connection)
+    backfill(connection)
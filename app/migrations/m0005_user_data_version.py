@@ -0,0 +1,9 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = "0005"
+description = "Per user data version for ETags"
+
+
+def upgrade(connection: Connection) -> None:
+    connection.execute(text("ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
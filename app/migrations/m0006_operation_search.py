@@ -0,0 +1,53 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.migrations import drop_invalid_index
+
+revision = "0006"
+description = "Full-text search index over operation descriptions"
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+transactional = False
+
+STATEMENTS = {
+    # btree_gin lets user_id share the GIN index with the document, so a search
+    # only visits the searching user's postings. The expression must match
+    # SEARCH_DOCUMENT in app.repositories.operation for the index to be used.
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS btree_gin",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_operations_search
+        ON operations USING gin (user_id, to_tsvector('simple', coalesce(description, '')))
+        """,
+    ],
+    # External content FTS5 table kept in sync with operations by triggers.
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS operations_fts
+        USING fts5(description, content='operations', content_rowid='id')
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS operations_fts_insert AFTER INSERT ON operations BEGIN
+            INSERT INTO operations_fts(rowid, description) VALUES (new.id, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS operations_fts_delete AFTER DELETE ON operations BEGIN
+            INSERT INTO operations_fts(operations_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS operations_fts_update AFTER UPDATE OF description ON operations BEGIN
+            INSERT INTO operations_fts(operations_fts, rowid, description) VALUES ('delete', old.id, old.description);
+            INSERT INTO operations_fts(rowid, description) VALUES (new.id, new.description);
+        END
+        """,
+        "INSERT INTO operations_fts(operations_fts) VALUES ('rebuild')",
+    ],
+}
+
+
+def upgrade(connection: Connection) -> None:
+    drop_invalid_index(connection, "ix_operations_search")
+    for statement in STATEMENTS.get(connection.dialect.name, []):
+        connection.execute(text(statement))
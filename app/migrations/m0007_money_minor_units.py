@@ -0,0 +1,23 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+revision = "0007"
+description = "Store money amounts as integer minor units"
+
+MONEY_COLUMNS = (
+    ("accounts", "balance"),
+    ("operations", "amount"),
+    ("category_monthly_totals", "total_amount"),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    for table, column in MONEY_COLUMNS:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BIGINT USING round({column}::numeric * 100)::bigint"
+            ))
+        else:
+            # SQLite cannot change a column type in place; the REAL column holds
+            # the integral minor-unit values exactly (up to 2**53).
+            connection.execute(text(f"UPDATE {table} SET {column} = CAST(round({column} * 100) AS INTEGER)"))
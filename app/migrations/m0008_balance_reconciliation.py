@@ -0,0 +1,36 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table, text
+from sqlalchemy.engine import Connection
+
+revision = "0008"
+description = "Opening balances and job checkpoints for balance reconciliation"
+
+metadata = MetaData()
+
+job_checkpoints = Table(
+    "job_checkpoints",
+    metadata,
+    Column("job", String(64), primary_key=True),
+    Column("chunk_start", Integer, primary_key=True),
+    Column("chunk_end", Integer, nullable=False),
+    Column("last_user_id", Integer, nullable=True),
+    Column("accounts_checked", BigInteger, nullable=False, default=0),
+    Column("discrepancies", Integer, nullable=False, default=0),
+    Column("fixed", Integer, nullable=False, default=0),
+    Column("completed_at", DateTime, nullable=True),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    connection.execute(text("ALTER TABLE accounts ADD COLUMN opening_balance BIGINT NOT NULL DEFAULT 0"))
+    # Existing balances are taken as correct: the opening balance is whatever
+    # the operations do not explain, so reconciliation only reports new drift.
+    connection.execute(text("""
+        UPDATE accounts SET opening_balance = balance - COALESCE((
+            SELECT SUM(CASE WHEN categories.type = 'EXPENSE' THEN -operations.amount ELSE operations.amount END)
+            FROM operations
+            JOIN categories ON categories.id = operations.category_id
+            WHERE operations.account_id = accounts.id
+        ), 0)
+    """))
+    job_checkpoints.create(connection)
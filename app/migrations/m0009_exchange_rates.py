@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, MetaData, Numeric, String, Table
+from sqlalchemy.engine import Connection
+
+revision = "0009"
+description = "Exchange rates for multi-currency totals"
+
+metadata = MetaData()
+
+exchange_rates = Table(
+    "exchange_rates",
+    metadata,
+    Column("currency", String(3), primary_key=True),
+    Column("rate", Numeric(20, 10), nullable=False),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(connection: Connection) -> None:
+    exchange_rates.create(connection)
@@ -0,0 +1,18 @@
+from sqlalchemy.engine import Connection
+
+from app.migrations import m0002_hot_filter_indexes, m0006_operation_search
+
+revision = "0010"
+description = "Rebuild concurrently built indexes left invalid by an interrupted build"
+
+# CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+transactional = False
+
+
+# Databases that recorded 0002 or 0006 as applied over an INVALID index; both
+# upgrades now drop such an index before creating it, and are otherwise no-ops.
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    m0002_hot_filter_indexes.upgrade(connection)
+    m0006_operation_search.upgrade(connection)
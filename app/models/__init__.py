@@ -2,5 +2,9 @@ from app.models.user import User
 from app.models.account import Account
 from app.models.category import Category, CategoryType
 from app.models.operation import Operation
+from app.models.category_total import CategoryMonthlyTotal
+from app.models.refresh_token import RefreshToken
+from app.models.job_checkpoint import JobCheckpoint
+from app.models.exchange_rate import ExchangeRate
 
-__all__ = ["User", "Account", "Category", "CategoryType", "Operation"]
\ No newline at end of file
+__all__ = ["User", "Account", "Category", "CategoryType", "Operation", "CategoryMonthlyTotal", "RefreshToken", "JobCheckpoint", "ExchangeRate"]
\ No newline at end of file
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime
+from sqlalchemy import Index, Column, String, Integer, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.core.database import Base
+from app.core.money import MoneyType
 
 class Account(Base):
     __tablename__ = "accounts"
@@ -10,11 +11,16 @@ class Account(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
-    balance = Column(Float, default=0.0)
+    balance = Column(MoneyType, default=0)
+    # balance = opening_balance + signed sum of the account's operations.
+    opening_balance = Column(MoneyType, nullable=False, default=0)
     currency = Column(String, default="KGS")
     icon = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="accounts")
-    operations = relationship("Operation", back_populates="account", cascade="all, delete-orphan")
\ No newline at end of file
+    operations = relationship("Operation", back_populates="account", cascade="all, delete-orphan")
+
+
+Index("ix_accounts_user_id", Account.user_id)
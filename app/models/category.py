@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime
+from sqlalchemy import Index, Column, Integer, String, Enum, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -23,4 +23,7 @@ class Category(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     user = relationship("User", back_populates="categories")
-    operations = relationship("Operation", back_populates="category", cascade="all, delete-orphan")
\ No newline at end of file
+    operations = relationship("Operation", back_populates="category", cascade="all, delete-orphan")
+
+
+Index("ix_categories_user_type", Category.user_id, Category.type)
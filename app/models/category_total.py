@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date
+
+from app.core.database import Base
+from app.core.money import MoneyType
+
+
+class CategoryMonthlyTotal(Base):
+    __tablename__ = "category_monthly_totals"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    total_amount = Column(MoneyType, nullable=False, default=0)
+    operations_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Numeric, String
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class ExchangeRate(Base):
+    __tablename__ = "exchange_rates"
+
+    currency = Column(String(3), primary_key=True)
+    # Units of BASE_CURRENCY per one unit of currency.
+    rate = Column(Numeric(20, 10), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
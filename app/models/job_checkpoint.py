@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+
+    job = Column(String(64), primary_key=True)
+    chunk_start = Column(Integer, primary_key=True)
+    chunk_end = Column(Integer, nullable=False)
+    last_user_id = Column(Integer, nullable=True)
+    accounts_checked = Column(BigInteger, nullable=False, default=0)
+    discrepancies = Column(Integer, nullable=False, default=0)
+    fixed = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
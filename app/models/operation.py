@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.core.database import Base
+from app.core.money import MoneyType
 
 
 class Operation(Base):
@@ -12,7 +13,7 @@ class Operation(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(MoneyType, nullable=False)
     description = Column(Text, nullable=True)
     operation_date = Column(DateTime, nullable=False, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -20,4 +21,9 @@ class Operation(Base):
     
     user = relationship("User", back_populates="operations")
     account = relationship("Account", back_populates="operations")
-    category = relationship("Category", back_populates="operations")
\ No newline at end of file
+    category = relationship("Category", back_populates="operations")
+
+
+Index("ix_operations_user_date_id", Operation.user_id, Operation.operation_date.desc(), Operation.id.desc())
+Index("ix_operations_user_account_date", Operation.user_id, Operation.account_id, Operation.operation_date)
+Index("ix_operations_user_category", Operation.user_id, Operation.category_id)
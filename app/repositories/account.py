@@ -1,7 +1,13 @@
+from decimal import Decimal
+
+from sqlalchemy import Row, case, func, type_coerce, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 
+from app.core.money import MoneyType
 from app.models.account import Account
+from app.models.category import Category, CategoryType
+from app.models.operation import Operation
 from app.schemas.account import AccountCreate, AccountUpdate
 
 
@@ -17,22 +23,34 @@ class AccountRepository:
         
     def get_all(self, user_id: int) -> List[Account]:
         return self.db.query(Account).filter(Account.user_id == user_id).all()
+
+    def get_existing_ids(self, user_id: int, account_ids: Iterable[int]) -> Set[int]:
+        return {
+            account_id for account_id, in self.db.query(Account.id).filter(
+                Account.user_id == user_id,
+                Account.id.in_(set(account_ids)),
+            )
+        }
     
-    def create(self, user_id: int, account: AccountCreate) -> Account:
+    def create(self, user_id: int, account: AccountCreate, commit: bool = True) -> Account:
         db_account = Account(
             user_id = user_id,
             name = account.name,
             balance = account.balance,
+            opening_balance = account.balance,
             currency = account.currency,
             icon = account.icon,
         )
         
         self.db.add(db_account)
-        self.db.commit()
-        self.db.refresh(db_account)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_account)
+        else:
+            self.db.flush()
         return db_account
     
-    def update(self, account_id: id, user_id: int, account_update: AccountUpdate) -> Optional[Account]:
+    def update(self, account_id: id, user_id: int, account_update: AccountUpdate, commit: bool = True) -> Optional[Account]:
         db_account = self.get_by_id(account_id, user_id)
         if not db_account:
             return None
@@ -40,32 +58,74 @@ class AccountRepository:
         if account_update.name is not None:
             db_account.name = account_update.name
         if account_update.balance is not None:
+            # Setting the balance moves the opening balance with it, so the
+            # operations still explain the difference.
+            db_account.opening_balance += account_update.balance - db_account.balance
             db_account.balance = account_update.balance
         if account_update.currency is not None:
             db_account.currency = account_update.currency
         if account_update.icon is not None:
             db_account.icon = account_update.icon
             
-        self.db.commit()
-        self.db.refresh(db_account)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_account)
+        else:
+            self.db.flush()
         return db_account
     
-    def delete(self, account_id: int, user_id: int) -> bool:
+    def delete(self, account_id: int, user_id: int, commit: bool = True) -> bool:
         db_account = self.get_by_id(account_id, user_id)
         if not db_account:
             return False
         
         self.db.delete(db_account)
-        self.db.commit()
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         
         return True
     
-    def update_balance(self, account_id: int, amount: float) -> Optional[Account]:
-        db_account = self.db.query(Account).filter(Account.id == account_id).first()
-        if not db_account:
-            return None
-        
-        db_account.balance += amount
-        self.db.commit()
-        self.db.refresh(db_account)
-        return db_account
\ No newline at end of file
+    def get_balances_by_currency(self, user_id: int) -> List[Row]:
+        return self.db.query(
+            Account.currency,
+            func.sum(Account.balance).label("balance"),
+        ).filter(Account.user_id == user_id).group_by(Account.currency).order_by(Account.currency).all()
+
+    def get_expected_balances(self, first_user_id: int, last_user_id: int) -> List[Row]:
+        signed_amount = case((Category.type == CategoryType.EXPENSE, -Operation.amount), else_=Operation.amount)
+        totals = self.db.query(
+            Operation.account_id,
+            func.sum(signed_amount).label("total"),
+        ).join(Category, Operation.category_id == Category.id).filter(
+            Operation.user_id.between(first_user_id, last_user_id)
+        ).group_by(Operation.account_id).subquery()
+        return self.db.query(
+            Account.id,
+            Account.user_id,
+            Account.balance,
+            type_coerce(Account.opening_balance + func.coalesce(totals.c.total, 0), MoneyType).label("expected"),
+        ).outerjoin(totals, totals.c.account_id == Account.id).filter(
+            Account.user_id.between(first_user_id, last_user_id)
+        ).order_by(Account.id).all()
+
+    def set_balance_if_unchanged(self, account_id: int, observed: Decimal, balance: Decimal) -> bool:
+        # Compare-and-set: a ledger write that landed after the balance was
+        # read wins, and the account is picked up again on the next run.
+        result = self.db.execute(
+            update(Account)
+            .where(Account.id == account_id, Account.balance == observed)
+            .values(balance=balance)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    def update_balance(self, account_id: int, amount: Decimal) -> bool:
+        result = self.db.execute(
+            update(Account)
+            .where(Account.id == account_id)
+            .values(balance=Account.balance + amount)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
\ No newline at end of file
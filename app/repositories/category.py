@@ -1,12 +1,22 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional
 
 from app.models.category import Category, CategoryType
-from app.models.operation import Operation
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
+# Same names and order as CategoryResponse.
+CATEGORY_COLUMNS = (
+    Category.name,
+    Category.type,
+    Category.icon,
+    Category.color,
+    Category.id,
+    Category.user_id,
+    Category.created_at,
+    Category.updated_at,
+)
+
 class CategoryRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -22,20 +32,20 @@ class CategoryRepository:
         if category_type:
             query = query.filter(Category.type == category_type)
         return query.all()
-    
-    def get_with_balances(self, user_id: int, category_type: Optional[CategoryType] = None) -> List[Dict]:
-        query = self.db.query(
-            Category,
-            func.coalesce(func.sum(Operation.amount), 0).label('total_amount')).outerjoin(Operation).filter(Category.user_id == user_id
-        )
-            
+
+    def get_types(self, user_id: int, category_ids: Iterable[int]) -> Dict[int, CategoryType]:
+        return dict(self.db.query(Category.id, Category.type).filter(
+            Category.user_id == user_id,
+            Category.id.in_(set(category_ids)),
+        ).all())
+
+    def get_rows(self, user_id: int, category_type: Optional[CategoryType] = None) -> List[Row]:
+        query = self.db.query(*CATEGORY_COLUMNS).filter(Category.user_id == user_id)
         if category_type:
             query = query.filter(Category.type == category_type)
-        
-        query = query.group_by(Category.id)
         return query.all()
     
-    def create(self, user_id: int, category: CategoryCreate) -> Category:
+    def create(self, user_id: int, category: CategoryCreate, commit: bool = True) -> Category:
         db_category = Category(
             user_id = user_id,
             name = category.name,
@@ -45,11 +55,14 @@ class CategoryRepository:
         )
         
         self.db.add(db_category)
-        self.db.commit()
-        self.db.refresh(db_category)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_category)
+        else:
+            self.db.flush()
         return db_category
     
-    def update(self, category_id: int, user_id: int, category_update: CategoryUpdate) -> Optional[Category]:
+    def update(self, category_id: int, user_id: int, category_update: CategoryUpdate, commit: bool = True) -> Optional[Category]:
         db_category = self.get_by_id(category_id, user_id)
         if not db_category:
             return None
@@ -63,14 +76,20 @@ class CategoryRepository:
         if category_update.color is not None:
             db_category.color = category_update.color
             
-        self.db.commit()
-        self.db.refresh(db_category)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_category)
+        else:
+            self.db.flush()
         return db_category
     
-    def delete(self, category_id: int, user_id: int) -> bool:
+    def delete(self, category_id: int, user_id: int, commit: bool = True) -> bool:
         db_category = self.get_by_id(category_id, user_id)
         if not db_category:
             return False
         self.db.delete(db_category)
-        self.db.commit()
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return True
\ No newline at end of file
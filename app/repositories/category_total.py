@@ -0,0 +1,126 @@
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.sql import date_trunc, day_after, month_start, to_date
+from app.models.category_total import CategoryMonthlyTotal
+from app.models.operation import Operation
+
+DateRange = Tuple[Optional[date], Optional[date]]
+
+UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+# Splits the inclusive [start_date, end_date] range into the whole months served
+# from the aggregates and the partial months at either edge (half-open ranges).
+def split_month_range(start_date: Optional[date], end_date: Optional[date]) -> Tuple[Optional[DateRange], List[DateRange]]:
+    end_exclusive = day_after(end_date) if end_date else None
+    first_full = start_date if not start_date or start_date.day == 1 else _next_month(start_date)
+    last_full = month_start(end_exclusive) if end_exclusive else None
+
+    if first_full and last_full and first_full >= last_full:
+        return None, [(start_date, end_exclusive)]
+
+    edges = []
+    if start_date and start_date < first_full:
+        edges.append((start_date, first_full))
+    if end_exclusive and last_full < end_exclusive:
+        edges.append((last_full, end_exclusive))
+    return (first_full, last_full), edges
+
+
+class CategoryTotalRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_deltas(self, user_id: int, deltas: Dict[Tuple[int, date], Tuple[Decimal, int]]) -> None:
+        rows = [
+            {
+                "user_id": user_id,
+                "category_id": category_id,
+                "month": month,
+                "total_amount": amount,
+                "operations_count": count,
+            }
+            for (category_id, month), (amount, count) in sorted(deltas.items())
+            if amount or count
+        ]
+        if not rows:
+            return
+
+        insert = UPSERT_DIALECTS[self.db.get_bind().dialect.name]
+        stmt = insert(CategoryMonthlyTotal)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "category_id", "month"],
+            set_={
+                "total_amount": CategoryMonthlyTotal.total_amount + stmt.excluded.total_amount,
+                "operations_count": CategoryMonthlyTotal.operations_count + stmt.excluded.operations_count,
+            },
+        )
+        self.db.execute(stmt, rows)
+
+    def get_account_totals(self, account_id: int) -> Dict[Tuple[int, date], Tuple[Decimal, int]]:
+        month = date_trunc("month", Operation.operation_date, self.db.get_bind().dialect.name)
+        rows = self.db.query(
+            Operation.category_id,
+            month.label("month"),
+            func.sum(Operation.amount),
+            func.count(Operation.id),
+        ).filter(Operation.account_id == account_id).group_by(Operation.category_id, month).all()
+        return {(category_id, to_date(month)): (total, count) for category_id, month, total, count in rows}
+
+    def delete_for_category(self, category_id: int) -> None:
+        self.db.query(CategoryMonthlyTotal).filter(
+            CategoryMonthlyTotal.category_id == category_id
+        ).delete(synchronize_session=False)
+
+    def get_totals(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Dict[int, Decimal]:
+        totals: Dict[int, Decimal] = {}
+        full_months, edges = split_month_range(start_date, end_date)
+
+        if full_months:
+            first_month, last_month = full_months
+            query = self.db.query(
+                CategoryMonthlyTotal.category_id,
+                func.sum(CategoryMonthlyTotal.total_amount),
+            ).filter(CategoryMonthlyTotal.user_id == user_id)
+            if first_month:
+                query = query.filter(CategoryMonthlyTotal.month >= first_month)
+            if last_month:
+                query = query.filter(CategoryMonthlyTotal.month < last_month)
+            for category_id, total in query.group_by(CategoryMonthlyTotal.category_id):
+                totals[category_id] = totals.get(category_id, 0) + total
+
+        if edges:
+            conditions = []
+            for lower, upper in edges:
+                bounds = []
+                if lower:
+                    bounds.append(Operation.operation_date >= lower)
+                if upper:
+                    bounds.append(Operation.operation_date < upper)
+                conditions.append(and_(*bounds))
+            query = self.db.query(
+                Operation.category_id,
+                func.sum(Operation.amount),
+            ).filter(Operation.user_id == user_id, or_(*conditions))
+            for category_id, total in query.group_by(Operation.category_id):
+                totals[category_id] = totals.get(category_id, 0) + total
+
+        return totals
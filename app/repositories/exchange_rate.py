@@ -0,0 +1,30 @@
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from typing import Dict
+
+from app.models.exchange_rate import ExchangeRate
+from app.repositories.category_total import UPSERT_DIALECTS
+
+
+class ExchangeRateRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_all(self) -> Dict[str, Decimal]:
+        return dict(self.db.query(ExchangeRate.currency, ExchangeRate.rate).all())
+
+    def upsert(self, rates: Dict[str, Decimal]) -> None:
+        if not rates:
+            return
+        now = datetime.utcnow()
+        insert = UPSERT_DIALECTS[self.db.get_bind().dialect.name]
+        stmt = insert(ExchangeRate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["currency"],
+            set_={"rate": stmt.excluded.rate, "updated_at": stmt.excluded.updated_at},
+        )
+        self.db.execute(stmt, [
+            {"currency": currency, "rate": rate, "updated_at": now}
+            for currency, rate in sorted(rates.items())
+        ])
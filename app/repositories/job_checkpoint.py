@@ -0,0 +1,48 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+
+from app.models.job_checkpoint import JobCheckpoint
+
+
+class JobCheckpointRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_all(self, job: str) -> Dict[int, JobCheckpoint]:
+        checkpoints = self.db.query(JobCheckpoint).filter(JobCheckpoint.job == job)
+        return {checkpoint.chunk_start: checkpoint for checkpoint in checkpoints}
+
+    def get(self, job: str, chunk_start: int) -> Optional[JobCheckpoint]:
+        return self.db.query(JobCheckpoint).filter(
+            JobCheckpoint.job == job,
+            JobCheckpoint.chunk_start == chunk_start,
+        ).first()
+
+    def create_missing(self, job: str, chunks: List[Tuple[int, int]]) -> None:
+        existing = self.get_all(job)
+        self.db.add_all([
+            JobCheckpoint(job=job, chunk_start=chunk_start, chunk_end=chunk_end)
+            for chunk_start, chunk_end in chunks
+            if chunk_start not in existing
+        ])
+        self.db.commit()
+
+    def delete(self, job: str) -> None:
+        self.db.query(JobCheckpoint).filter(JobCheckpoint.job == job).delete(synchronize_session=False)
+        self.db.commit()
+
+    def advance(
+        self,
+        checkpoint: JobCheckpoint,
+        last_user_id: int,
+        accounts_checked: int,
+        discrepancies: int,
+        fixed: int,
+    ) -> None:
+        checkpoint.last_user_id = last_user_id
+        checkpoint.accounts_checked += accounts_checked
+        checkpoint.discrepancies += discrepancies
+        checkpoint.fixed += fixed
+        if last_user_id >= checkpoint.chunk_end:
+            checkpoint.completed_at = datetime.utcnow()
@@ -1,44 +1,137 @@
+from sqlalchemy import Float, Row, and_, cast, column, func, insert, literal, literal_column, or_, table, text
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, date
 
+from app.core.sql import date_range_filters
 from app.models.operation import Operation
 from app.models.account import Account
 from app.models.category import Category, CategoryType
 from app.schemas.operation import OperationCreate, OperationUpdate
 
+# Same names and order as OperationResponse, so rows map straight onto it.
+OPERATION_COLUMNS = (
+    Operation.account_id,
+    Operation.category_id,
+    Operation.amount,
+    Operation.description,
+    Operation.operation_date,
+    Operation.id,
+    Operation.user_id,
+    Operation.created_at,
+    Operation.updated_at,
+)
+OPERATION_DETAIL_COLUMNS = OPERATION_COLUMNS + (
+    Account.name.label('account_name'),
+    Category.name.label('category_name'),
+    Category.type.label('category_type'),
+)
+
+# Must stay identical to the ix_operations_search expression (m0006) on PostgreSQL.
+SEARCH_DOCUMENT = func.to_tsvector(literal_column("'simple'"), func.coalesce(Operation.description, ''))
+# FTS5 mirror of operations.description on SQLite (m0006).
+operations_fts = table("operations_fts", column("rowid"))
 
 class OperationRepository:
     def __init__(self, db: Session):
         self.db = db
         
-    def get_by_id(self, operation_id: int, user_id: int) -> Optional[Operation]:
-        return self.db.query(Operation).filter(
+    def get_by_id(self, operation_id: int, user_id: int, for_update: bool = False) -> Optional[Operation]:
+        query = self.db.query(Operation).filter(
             Operation.id == operation_id,
             Operation.user_id == user_id,
-        ).first()
+        )
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
+
+    def get_by_ids(self, operation_ids: Iterable[int], user_id: int, for_update: bool = False) -> Dict[int, Operation]:
+        query = self.db.query(Operation).filter(
+            Operation.id.in_(set(operation_ids)),
+            Operation.user_id == user_id,
+        ).order_by(Operation.id)
+        if for_update:
+            query = query.with_for_update()
+        return {operation.id: operation for operation in query}
         
-    def get_all(
+    def _apply_filters(
         self,
+        query,
         user_id: int,
         account_id: Optional[int] = None,
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> List[Operation]:
-        query = self.db.query(Operation).filter(Operation.user_id == user_id)
-        
+        cursor: Optional[Tuple[datetime, int]] = None,
+    ):
+        query = query.filter(Operation.user_id == user_id)
+
         if account_id:
             query = query.filter(Operation.account_id == account_id)
         if category_id:
             query = query.filter(Operation.category_id == category_id)
-        if start_date:
-            query = query.filter(Operation.operation_date >= start_date)
-        if end_date:
-            query = query.filter(Operation.operation_date <= end_date)
-            
-        return query.order_by(Operation.operation_date.desc()).all()
-    
+        query = query.filter(*date_range_filters(Operation.operation_date, start_date, end_date))
+        if cursor:
+            cursor_date, cursor_id = cursor
+            query = query.filter(or_(
+                Operation.operation_date < cursor_date,
+                and_(Operation.operation_date == cursor_date, Operation.id < cursor_id),
+            ))
+
+        return query.order_by(Operation.operation_date.desc(), Operation.id.desc())
+
+    def get_all(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Operation]:
+        query = self._apply_filters(
+            self.db.query(Operation), user_id, account_id, category_id, start_date, end_date, cursor
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_rows(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Row]:
+        query = self._apply_filters(
+            self.db.query(*OPERATION_COLUMNS), user_id, account_id, category_id, start_date, end_date, cursor
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def iter_rows(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        query = self._apply_filters(
+            self.db.query(*OPERATION_COLUMNS), user_id, account_id, category_id, start_date, end_date, cursor
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.yield_per(batch_size)
+
     def get_with_details(
         self,
         user_id: int,
@@ -46,26 +139,89 @@ class OperationRepository:
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
-    ) -> List[tuple]:
+        cursor: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Row]:
+        query = self.db.query(*OPERATION_DETAIL_COLUMNS).join(
+            Account, Operation.account_id == Account.id
+        ).join(Category, Operation.category_id == Category.id)
+        query = self._apply_filters(
+            query, user_id, account_id, category_id, start_date, end_date, cursor
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    
+    def stream_with_details(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
         query = self.db.query(
-            Operation,
+            Operation.id,
+            Operation.account_id,
             Account.name.label('account_name'),
+            Operation.category_id,
             Category.name.label('category_name'),
-            Category.type.label('category_type')
-        ).join(Account).join(Category).filter(Operation.user_id == user_id)
-        
-        if account_id:
-            query = query.filter(Operation.account_id == account_id)
-        if category_id:
-            query = query.filter(Operation.category_id == category_id)
-        if start_date:
-            query = query.filter(Operation.operation_date >= start_date)
-        if end_date:
-            query = query.filter(Operation.operation_date <= end_date)
-        
-        return query.order_by(Operation.operation_date.desc()).all()
-    
-    def create(self, user_id: int, operation: OperationCreate) -> Operation:
+            Category.type.label('category_type'),
+            Operation.amount,
+            Operation.description,
+            Operation.operation_date,
+            Operation.created_at,
+            Operation.updated_at,
+        ).join(Account, Operation.account_id == Account.id).join(Category, Operation.category_id == Category.id)
+        query = self._apply_filters(query, user_id, account_id, category_id, start_date, end_date)
+        return query.yield_per(batch_size)
+
+    def search(
+        self,
+        user_id: int,
+        terms: List[str],
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[Tuple[float, int]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Row]:
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            ts_query = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms))
+            # ts_rank returns real; widened to double precision here so the rank a
+            # cursor carries back compares equal to the one it was read from.
+            rank = cast(func.ts_rank(SEARCH_DOCUMENT, ts_query), Float(53))
+            query = self.db.query(*OPERATION_COLUMNS, rank.label('rank')).filter(SEARCH_DOCUMENT.op('@@')(ts_query))
+        elif dialect == "sqlite":
+            # bm25() is lower for better matches, so it is negated to rank descending.
+            rank = -func.bm25(literal_column("operations_fts"))
+            query = self.db.query(*OPERATION_COLUMNS, rank.label('rank')).join(
+                operations_fts, operations_fts.c.rowid == Operation.id
+            ).filter(
+                text("operations_fts MATCH :match").bindparams(match=" ".join(f'"{term}"*' for term in terms))
+            )
+        else:
+            rank = literal(0.0)
+            query = self.db.query(*OPERATION_COLUMNS, rank.label('rank')).filter(
+                *(Operation.description.ilike(f"%{term}%") for term in terms)
+            )
+
+        query = self._apply_filters(query, user_id, account_id, category_id, start_date, end_date).order_by(None)
+        if cursor:
+            cursor_rank, cursor_id = cursor
+            query = query.filter(or_(
+                rank < cursor_rank,
+                and_(rank == cursor_rank, Operation.id < cursor_id),
+            ))
+        query = query.order_by(rank.desc(), Operation.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def create(self, user_id: int, operation: OperationCreate, commit: bool = True) -> Operation:
         db_operation = Operation(
             user_id = user_id,
             account_id = operation.account_id,
@@ -76,15 +232,57 @@ class OperationRepository:
         )
         
         self.db.add(db_operation)
-        self.db.commit()
-        self.db.refresh(db_operation)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_operation)
+        else:
+            self.db.flush()
         return db_operation
     
-    def update(self, operation_id: int, user_id: int, operation_update: OperationUpdate) -> Optional[Operation]:
+    # Sent as multi-row INSERTs on both PostgreSQL and SQLite. With returning,
+    # the created rows come back in the order of `operations`: ids are assigned
+    # in VALUES order, and sorting by them keeps SQLite batched where
+    # sort_by_parameter_order would fall back to one INSERT per row.
+    def bulk_create(self, user_id: int, operations: List[OperationCreate], returning: bool = False) -> List[Row]:
+        if not operations:
+            return []
+        stmt = insert(Operation)
+        if returning:
+            stmt = stmt.returning(*OPERATION_COLUMNS)
+        result = self.db.execute(stmt, [
+            {
+                "user_id": user_id,
+                "account_id": operation.account_id,
+                "category_id": operation.category_id,
+                "amount": operation.amount,
+                "description": operation.description,
+                "operation_date": operation.operation_date,
+            }
+            for operation in operations
+        ])
+        return sorted(result.all(), key=lambda row: row.id) if returning else []
+
+    def update(
+        self,
+        operation_id: int,
+        user_id: int,
+        operation_update: OperationUpdate,
+        commit: bool = True,
+    ) -> Optional[Operation]:
         db_operation = self.get_by_id(operation_id, user_id)
         if not db_operation:
             return None
 
+        self.apply_update(db_operation, operation_update)
+        if commit:
+            self.db.commit()
+            self.db.refresh(db_operation)
+        else:
+            self.db.flush()
+        return db_operation
+
+    @staticmethod
+    def apply_update(db_operation: Operation, operation_update: OperationUpdate) -> None:
         if operation_update.account_id is not None:
             db_operation.account_id = operation_update.account_id
         if operation_update.category_id is not None:
@@ -96,14 +294,13 @@ class OperationRepository:
         if operation_update.operation_date is not None:
             db_operation.operation_date = operation_update.operation_date
 
-        self.db.commit()
-        self.db.refresh(db_operation)
-        return db_operation
-
-    def delete(self, operation_id: int, user_id: int) -> Optional[Operation]:
+    def delete(self, operation_id: int, user_id: int, commit: bool = True) -> Optional[Operation]:
         db_operation = self.get_by_id(operation_id, user_id)
         if not db_operation:
             return False
         self.db.delete(db_operation)
-        self.db.commit()
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         return db_operation
\ No newline at end of file
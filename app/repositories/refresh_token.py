@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.refresh_token import RefreshToken
+
+
+# Rotation revokes each token as it issues the next one, so a family is
+# revoked once none of its tokens is left unrevoked.
+def _active_token_in_family(family_id: str):
+    return select(RefreshToken.jti).where(
+        RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None)
+    ).limit(1)
+
+
+class RefreshTokenRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_for_update(self, jti: str) -> Optional[RefreshToken]:
+        return self.db.query(RefreshToken).filter(RefreshToken.jti == jti).with_for_update().first()
+
+    def create(self, jti: str, family_id: str, user_id: int, expires_at: datetime, commit: bool = True) -> RefreshToken:
+        db_token = RefreshToken(jti=jti, family_id=family_id, user_id=user_id, expires_at=expires_at)
+        self.db.add(db_token)
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+        return db_token
+
+    def is_family_revoked(self, family_id: str) -> bool:
+        return self.db.execute(_active_token_in_family(family_id)).first() is None
+
+    def revoke(self, db_token: RefreshToken) -> None:
+        db_token.revoked_at = datetime.utcnow()
+        self.db.flush()
+
+    def revoke_family(self, family_id: str) -> None:
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+
+    def revoke_all_for_user(self, user_id: int) -> List[str]:
+        now = datetime.utcnow()
+        families = [
+            family_id for (family_id,) in self.db.query(RefreshToken.family_id)
+            .filter(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None), RefreshToken.expires_at > now)
+            .distinct()
+        ]
+        self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        return families
+
+    def delete_expired_for_user(self, user_id: int) -> None:
+        self.db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= datetime.utcnow())
+        )
+
+
+class AsyncRefreshTokenRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def is_family_revoked(self, family_id: str) -> bool:
+        return (await self.db.execute(_active_token_in_family(family_id))).first() is None
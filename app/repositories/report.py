@@ -0,0 +1,89 @@
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, Query
+from typing import List, Optional
+from datetime import date
+
+from app.core.sql import date_range_filters, date_trunc
+from app.models.account import Account
+from app.models.category import Category, CategoryType
+from app.models.operation import Operation
+
+
+class ReportRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _filter(
+        query: Query,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+    ) -> Query:
+        query = query.filter(Operation.user_id == user_id)
+        query = query.filter(*date_range_filters(Operation.operation_date, start_date, end_date))
+        if account_id:
+            query = query.filter(Operation.account_id == account_id)
+        if category_id:
+            query = query.filter(Operation.category_id == category_id)
+        return query
+
+    @staticmethod
+    def _sum_by_type(category_type: CategoryType):
+        return func.coalesce(func.sum(case((Category.type == category_type, Operation.amount), else_=0)), 0)
+
+    def get_time_series(
+        self,
+        user_id: int,
+        bucket: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+    ) -> List[tuple]:
+        period = date_trunc(bucket, Operation.operation_date, self.db.get_bind().dialect.name).label("period")
+        query = self.db.query(
+            period,
+            self._sum_by_type(CategoryType.INCOME).label("income"),
+            self._sum_by_type(CategoryType.EXPENSE).label("expense"),
+        ).join(Category, Operation.category_id == Category.id)
+        query = self._filter(query, user_id, start_date, end_date, account_id, category_id)
+        return query.group_by(period).order_by(period).all()
+
+    def get_category_breakdown(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        account_id: Optional[int] = None,
+        category_type: Optional[CategoryType] = None,
+    ) -> List[tuple]:
+        query = self.db.query(
+            Category.id,
+            Category.name,
+            Category.type,
+            func.sum(Operation.amount).label("total"),
+            func.count(Operation.id).label("count"),
+        ).join(Category, Operation.category_id == Category.id)
+        query = self._filter(query, user_id, start_date, end_date, account_id)
+        if category_type:
+            query = query.filter(Category.type == category_type)
+        return query.group_by(Category.id, Category.name, Category.type).order_by(func.sum(Operation.amount).desc()).all()
+
+    def get_account_cash_flow(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[tuple]:
+        query = self.db.query(
+            Account.id,
+            Account.name,
+            Account.currency,
+            self._sum_by_type(CategoryType.INCOME).label("income"),
+            self._sum_by_type(CategoryType.EXPENSE).label("expense"),
+        ).join(Account, Operation.account_id == Account.id).join(Category, Operation.category_id == Category.id)
+        query = self._filter(query, user_id, start_date, end_date)
+        return query.group_by(Account.id, Account.name, Account.currency).order_by(Account.id).all()
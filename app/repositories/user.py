@@ -1,3 +1,5 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -13,6 +15,18 @@ class UserRepository:
     
     def get_by_email(self, email: str) -> Optional[User]:
         return self.db.query(User).filter(User.email == email).first()
+
+    def get_data_version(self, user_id: int) -> Optional[int]:
+        return self.db.query(User.data_version).filter(User.id == user_id).scalar()
+
+    def bump_data_version(self, user_id: int) -> None:
+        # updated_at is passed through so the profile timestamp is untouched.
+        self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+            .execution_options(synchronize_session=False)
+        )
     
     def get_by_username(self, username: str) -> Optional[User]:
         return self.db.query(User).filter(User.username == username).first()
@@ -45,6 +59,10 @@ class UserRepository:
         self.db.refresh(db_user)
         return db_user
     
+    def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        self.db.execute(update(User).where(User.id == user_id).values(hashed_password=hashed_password))
+        self.db.commit()
+
     def delete(self, user_id: int) -> bool:
         db_user = self.get_by_id(user_id)
         if not db_user:
@@ -53,4 +71,12 @@ class UserRepository:
         self.db.delete(db_user)
         self.db.commit()
         
-        return True
\ No newline at end of file
+        return True
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalar_one_or_none()
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
-from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse
+from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, TotalBalance
 from app.services.account import AccountService
 from app.services.auth import get_current_user_id
+from app.services.data_version import ConditionalGet, conditional_get
+from app.services.exchange_rate import conditional_get_with_rates
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
@@ -22,20 +24,23 @@ def create_account(
 
 @router.get("/", response_model=List[AccountResponse])
 def get_accounts(
+    conditional: ConditionalGet = Depends(conditional_get),
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     service = AccountService(db)
-    return service.get_all_accounts(current_user_id)
+    return conditional.respond(lambda: service.get_all_accounts(current_user_id))
 
 
-@router.get("/balance")
+@router.get("/balance", response_model=TotalBalance)
 def get_total_balance(
+    currency: Optional[str] = Query(None, pattern="^[A-Z]{3}$"),
+    conditional: ConditionalGet = Depends(conditional_get_with_rates),
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     service = AccountService(db)
-    return service.get_total_balance(current_user_id)
+    return conditional.respond(lambda: service.get_total_balance(current_user_id, currency))
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
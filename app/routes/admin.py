@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.schemas.exchange_rate import ExchangeRatesResponse, ExchangeRatesUpdate
+from app.services.auth import require_admin_key
+from app.services.exchange_rate import ExchangeRateService
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_key)])
+
+
+@router.get("/exchange-rates", response_model=ExchangeRatesResponse)
+def get_exchange_rates(db: Session = Depends(get_db)):
+    service = ExchangeRateService(db)
+    return ExchangeRatesResponse(base_currency=settings.BASE_CURRENCY, rates=service.get_rates())
+
+
+@router.put("/exchange-rates", response_model=ExchangeRatesResponse)
+def update_exchange_rates(
+    rates_update: ExchangeRatesUpdate,
+    db: Session = Depends(get_db)
+):
+    service = ExchangeRateService(db)
+    return ExchangeRatesResponse(base_currency=settings.BASE_CURRENCY, rates=service.set_rates(rates_update.rates))
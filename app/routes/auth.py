@@ -1,30 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.schemas.user import UserCreate, UserLogin, Token, UserResponse
+from app.schemas.user import RefreshTokenRequest, UserCreate, UserLogin, Token, UserResponse
+from app.services.token import TokenService
 from app.services.user import UserService
-from app.services.auth import AuthService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     service = UserService(db)
-    return service.create_user(user)
+    return await service.create_user(user)
 
 
 @router.post("/login", response_model=Token)
-def login(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login(user_login: UserLogin, db: Session = Depends(get_db)):
     service = UserService(db)
-    user = service.authenticate_user(user_login.email, user_login.password)
+    user_id = await service.authenticate_user(user_login.email, user_login.password)
     
-    if not user:
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
-    access_token = AuthService.create_access_token(data={"sub": str(user.id)})
-    return Token(access_token=access_token, token_type="bearer")
\ No newline at end of file
+    return await run_in_threadpool(TokenService(db).issue_tokens, user_id)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+    service = TokenService(db)
+    return service.refresh(request.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+    service = TokenService(db)
+    service.logout(request.refresh_token)
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import date
 
 from app.core.database import get_db
+from app.core.serialization import FastJSONResponse
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithBalance
 from app.services.category import CategoryService
 from app.services.auth import get_current_user_id
+from app.services.data_version import ConditionalGet, conditional_get
 from app.models.category import CategoryType
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -24,21 +27,26 @@ def create_category(
 @router.get("/", response_model=List[CategoryResponse])
 def get_categories(
     category_type: Optional[CategoryType] = Query(None),
+    conditional: ConditionalGet = Depends(conditional_get),
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     service = CategoryService(db)
-    return service.get_all_categories(current_user_id, category_type)
+    return conditional.respond(lambda: service.get_all_categories(current_user_id, category_type))
 
 
 @router.get("/with-balances", response_model=List[CategoryWithBalance])
 def get_categories_with_balances(
     category_type: Optional[CategoryType] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     service = CategoryService(db)
-    return service.get_categories_with_balances(current_user_id, category_type)
+    return FastJSONResponse(
+        service.get_categories_with_balances(current_user_id, category_type, start_date, end_date)
+    )
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
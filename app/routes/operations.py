@@ -1,12 +1,32 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, File, status, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 
 from app.core.database import get_db
-from app.schemas.operation import OperationCreate, OperationUpdate, OperationResponse, OperationWithDetails
+from app.core.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.core.serialization import FastJSONResponse
+from app.schemas.operation import (
+    OperationCreate,
+    OperationUpdate,
+    OperationResponse,
+    OperationWithDetails,
+    OperationSearchResult,
+    OperationImportResult,
+    OperationBatchRequest,
+    OperationBatchResult,
+)
 from app.services.operation import OperationService
+from app.services.operation_batch import OperationBatchService
+from app.services.operation_io import (
+    EXPORT_FORMATS,
+    OperationExportService,
+    OperationImportService,
+    detect_import_format,
+)
 from app.services.auth import get_current_user_id
+from app.services.data_version import ConditionalGet, conditional_get
 
 router = APIRouter(prefix="/operations", tags=["operations"])
 
@@ -21,8 +41,31 @@ def create_operation(
     return service.create_operation(current_user_id, operation)
 
 
-@router.get("/", response_model=List[OperationResponse])
-def get_operations(
+@router.post("/batch", response_model=OperationBatchResult)
+def batch_operations(
+    batch: OperationBatchRequest,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    service = OperationBatchService(db)
+    return service.apply_batch(current_user_id, batch)
+
+
+@router.post("/import", response_model=OperationImportResult)
+def import_operations(
+    file: UploadFile = File(...),
+    import_format: Optional[str] = Query(None, alias="format", pattern="^(csv|json|ndjson)$"),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    import_format = import_format or detect_import_format(file.filename, file.content_type)
+    service = OperationImportService(db)
+    return service.import_operations(current_user_id, file.file, import_format)
+
+
+@router.get("/export")
+def export_operations(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$"),
     account_id: Optional[int] = Query(None),
     category_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
@@ -30,14 +73,67 @@ def get_operations(
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
-    service = OperationService(db)
-    return service.get_all_operations(
+    service = OperationExportService(db)
+    content = service.export_operations(
         current_user_id,
+        export_format,
         account_id,
         category_id,
         start_date,
         end_date
     )
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="operations.{extension}"'}
+    )
+
+
+@router.get("/", response_model=List[OperationResponse])
+def get_operations(
+    account_id: Optional[int] = Query(None),
+    category_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    conditional: ConditionalGet = Depends(conditional_get),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    service = OperationService(db)
+    if response_format == "ndjson":
+        return StreamingResponse(
+            service.stream_operations(
+                current_user_id,
+                account_id,
+                category_id,
+                start_date,
+                end_date,
+                cursor,
+                limit
+            ),
+            media_type="application/x-ndjson",
+            headers=conditional.headers
+        )
+
+    def build():
+        operations, next_cursor = service.get_operation_rows(
+            current_user_id,
+            account_id,
+            category_id,
+            start_date,
+            end_date,
+            cursor,
+            limit
+        )
+        if next_cursor:
+            conditional.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return operations
+
+    return conditional.respond(build, fast=True)
 
 
 @router.get("/details", response_model=List[OperationWithDetails])
@@ -46,17 +142,50 @@ def get_operations_with_details(
     category_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     service = OperationService(db)
-    return service.get_operations_with_details(
+    operations, next_cursor = service.get_operations_with_details(
         current_user_id,
         account_id,
         category_id,
         start_date,
-        end_date
+        end_date,
+        cursor,
+        limit
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(operations, headers=headers)
+
+
+@router.get("/search", response_model=List[OperationSearchResult])
+def search_operations(
+    q: str = Query(..., min_length=1, max_length=200),
+    account_id: Optional[int] = Query(None),
+    category_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    service = OperationService(db)
+    operations, next_cursor = service.search_operations(
+        current_user_id,
+        q,
+        account_id,
+        category_id,
+        start_date,
+        end_date,
+        cursor,
+        limit
     )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(operations, headers=headers)
 
 
 @router.get("/{operation_id}", response_model=OperationResponse)
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+
+from app.core.database import get_db
+from app.models.category import CategoryType
+from app.schemas.report import AccountCashFlow, CategoryBreakdown, ReportBucket, TimeSeriesPoint
+from app.services.auth import get_current_user_id
+from app.services.report import ReportService
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/timeseries", response_model=List[TimeSeriesPoint])
+def get_time_series(
+    bucket: ReportBucket = Query(ReportBucket.MONTH),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    account_id: Optional[int] = Query(None),
+    category_id: Optional[int] = Query(None),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    service = ReportService(db)
+    return service.get_time_series(current_user_id, bucket, start_date, end_date, account_id, category_id)
+
+
+@router.get("/categories", response_model=List[CategoryBreakdown])
+def get_category_breakdown(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    account_id: Optional[int] = Query(None),
+    category_type: Optional[CategoryType] = Query(None),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    service = ReportService(db)
+    return service.get_category_breakdown(current_user_id, start_date, end_date, account_id, category_type)
+
+
+@router.get("/accounts/cash-flow", response_model=List[AccountCashFlow])
+def get_account_cash_flow(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    service = ReportService(db)
+    return service.get_account_cash_flow(current_user_id, start_date, end_date)
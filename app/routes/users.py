@@ -19,13 +19,13 @@ def get_current_user(
 
 
 @router.put("/me", response_model=UserResponse)
-def update_current_user(
+async def update_current_user(
     user_update: UserUpdate,
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     service = UserService(db)
-    return service.update_user(current_user_id, user_update)
+    return await service.update_user(current_user_id, user_update)
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
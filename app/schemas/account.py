@@ -1,6 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from app.core.money import Money
 
 
 class AccountBase(BaseModel):
@@ -10,21 +12,34 @@ class AccountBase(BaseModel):
     
     
 class AccountCreate(AccountBase):
-    balance: float = 0.0
+    balance: Money = 0
     
     
 class AccountUpdate(BaseModel):
     name: Optional[str] = None
-    balance: Optional[str] = None
+    balance: Optional[Money] = None
     currency: Optional[str] = None
     icon: Optional[str] = None
     
 class AccountResponse(AccountBase):
     id: int
     user_id: int
-    balance: float
+    balance: Money
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class CurrencyBalance(BaseModel):
+    currency: str
+    balance: Money
+
+
+class TotalBalance(BaseModel):
+    total_balance: Money
+    currency: str
+    balances: List[CurrencyBalance]
+    # Currencies without an exchange rate, left out of total_balance.
+    unconverted: List[str] = []
@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 
+from app.core.money import Money
 from app.models.category import CategoryType
 
 
@@ -32,4 +33,4 @@ class CategoryResponse(CategoryBase):
         
 
 class CategoryWithBalance(CategoryResponse):
-    total_amount: float
\ No newline at end of file
+    total_amount: Money
\ No newline at end of file
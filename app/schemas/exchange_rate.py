@@ -0,0 +1,28 @@
+from pydantic import BaseModel, field_validator
+from decimal import Decimal
+from typing import Dict
+
+CURRENCY_CODE_LENGTH = 3
+
+
+def validate_rates(rates: Dict[str, Decimal]) -> Dict[str, Decimal]:
+    for currency, rate in rates.items():
+        if len(currency) != CURRENCY_CODE_LENGTH or not currency.isalpha() or not currency.isupper():
+            raise ValueError(f"{currency!r} is not a three-letter uppercase currency code")
+        if not rate.is_finite() or rate <= 0:
+            raise ValueError(f"Rate for {currency} must be a positive number")
+    return rates
+
+
+class ExchangeRatesUpdate(BaseModel):
+    rates: Dict[str, Decimal]
+
+    @field_validator("rates")
+    @classmethod
+    def check_rates(cls, rates: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        return validate_rates(rates)
+
+
+class ExchangeRatesResponse(BaseModel):
+    base_currency: str
+    rates: Dict[str, float]
@@ -1,12 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
+
+from app.core.config import settings
+from app.core.money import Money
 
 
 class OperationBase(BaseModel):
     account_id: int
     category_id: int
-    amount: float
+    amount: Money
     description: Optional[str] = None
     operation_date: datetime
     
@@ -18,7 +21,7 @@ class OperationCreate(OperationBase):
 class OperationUpdate(BaseModel):
     account_id: Optional[int] = None
     category_id: Optional[int] = None
-    amount: Optional[float] = None
+    amount: Optional[Money] = None
     description: Optional[str] = None
     operation_date: Optional[datetime] = None
     
@@ -34,4 +37,59 @@ class OperationResponse(OperationBase):
 class OperationWithDetails(OperationResponse):
     account_name: str
     category_name: str
-    category_type: str
\ No newline at end of file
+    category_type: str
+
+class OperationSearchResult(OperationResponse):
+    rank: float
+
+class OperationImportError(BaseModel):
+    row: int
+    error: str
+
+
+class OperationImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[OperationImportError] = []
+
+
+class OperationBatchCreate(OperationCreate):
+    action: Literal["create"]
+
+
+class OperationBatchUpdate(OperationUpdate):
+    action: Literal["update"]
+    id: int
+
+
+class OperationBatchDelete(BaseModel):
+    action: Literal["delete"]
+    id: int
+
+
+OperationBatchItem = Annotated[
+    Union[OperationBatchCreate, OperationBatchUpdate, OperationBatchDelete],
+    Field(discriminator="action"),
+]
+
+
+class OperationBatchRequest(BaseModel):
+    items: List[OperationBatchItem] = Field(
+        ..., min_length=1, max_length=settings.OPERATION_BATCH_MAX_SIZE
+    )
+    atomic: bool = False
+
+
+class OperationBatchItemResult(BaseModel):
+    index: int
+    action: str
+    status: int
+    operation: Optional[OperationResponse] = None
+    error: Optional[str] = None
+
+
+class OperationBatchResult(BaseModel):
+    applied: int
+    failed: int
+    results: List[OperationBatchItemResult]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.core.money import Money
+
+
+class AccountDiscrepancy(BaseModel):
+    account_id: int
+    user_id: int
+    stored: Money
+    expected: Money
+    fixed: bool = False
+
+
+class ReconciliationReport(BaseModel):
+    job: str
+    chunks: int
+    accounts_checked: int
+    discrepancies: int
+    fixed: int
+    found: List[AccountDiscrepancy] = []
@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from datetime import date
+from enum import Enum
+
+from app.core.money import Money
+
+
+class ReportBucket(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class TimeSeriesPoint(BaseModel):
+    period: date
+    income: Money
+    expense: Money
+    net: Money
+
+
+class CategoryBreakdown(BaseModel):
+    category_id: int
+    category_name: str
+    category_type: str
+    total: Money
+    count: int
+    share: float
+
+
+class AccountCashFlow(BaseModel):
+    account_id: int
+    account_name: str
+    currency: str
+    income: Money
+    expense: Money
+    net: Money
@@ -29,6 +29,12 @@ class UserResponse(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+    
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
     
 class TokenData(BaseModel):
-    user_id: Optional[int] = None
\ No newline at end of file
+    user_id: Optional[int] = None
+    family_id: Optional[str] = None
\ No newline at end of file
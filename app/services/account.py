@@ -1,17 +1,33 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List
+from decimal import Decimal
+from typing import List, Optional, Tuple
 
+from app.core.cache import create_cache
+from app.core.config import settings
 from app.repositories.account import AccountRepository
-from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse
+from app.schemas.account import AccountCreate, AccountUpdate, AccountResponse, CurrencyBalance, TotalBalance
+from app.services.data_version import get_data_version, user_data_write
+from app.services.exchange_rate import ExchangeRateService
+from app.services.ledger import BalanceLedger
+
+# One entry per user tagged with the data version it was computed at; every
+# account and operation write bumps the version, so a mismatch is a miss.
+balance_summary_cache = create_cache(
+    "balance-summary",
+    settings.BALANCE_SUMMARY_CACHE_MAX_SIZE,
+    settings.BALANCE_SUMMARY_CACHE_TTL_SECONDS,
+)
 
 
 class AccountService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = AccountRepository(db)
 
     def create_account(self, user_id: int, account: AccountCreate) -> AccountResponse:
-        db_account = self.repo.create(user_id, account)
+        with user_data_write(self.db, user_id):
+            db_account = self.repo.create(user_id, account, commit=False)
         return AccountResponse.model_validate(db_account)
 
     def get_account(self, account_id: int, user_id: int) -> AccountResponse:
@@ -28,26 +44,52 @@ class AccountService:
         return [AccountResponse.model_validate(acc) for acc in accounts]
 
     def update_account(self, account_id: int, user_id: int, account_update: AccountUpdate) -> AccountResponse:
-        account = self.repo.update(account_id, user_id, account_update)
-        if not account:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Account not found"
-            )
+        with user_data_write(self.db, user_id):
+            account = self.repo.update(account_id, user_id, account_update, commit=False)
+            if not account:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Account not found"
+                )
         return AccountResponse.model_validate(account)
 
     def delete_account(self, account_id: int, user_id: int) -> bool:
-        if not self.repo.delete(account_id, user_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Account not found"
-            )
+        with user_data_write(self.db, user_id):
+            ledger = BalanceLedger(self.db, user_id)
+            ledger.revert_account(account_id)
+            if not self.repo.delete(account_id, user_id, commit=False):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Account not found"
+                )
+            ledger.flush()
         return True
 
-    def get_total_balance(self, user_id: int) -> dict:
-        accounts = self.repo.get_all(user_id)
-        total_balance = sum(acc.balance for acc in accounts)
-        return {
-            "total_balance": total_balance,
-            "currency": "KGS"  
-        }
\ No newline at end of file
+    def get_total_balance(self, user_id: int, currency: Optional[str] = None) -> TotalBalance:
+        currency = currency or settings.BASE_CURRENCY
+        balances = self.get_balances_by_currency(user_id)
+        total_balance, unconverted = ExchangeRateService(self.db).convert_total(balances, currency)
+        return TotalBalance(
+            total_balance=total_balance,
+            currency=currency,
+            balances=[CurrencyBalance(currency=balance_currency, balance=balance) for balance_currency, balance in balances],
+            unconverted=unconverted,
+        )
+
+    def get_balances_by_currency(self, user_id: int) -> List[Tuple[str, Decimal]]:
+        if settings.BALANCE_SUMMARY_CACHE_TTL_SECONDS <= 0:
+            return [(row.currency, row.balance) for row in self.repo.get_balances_by_currency(user_id)]
+
+        # The version is read before the balances, so a cached summary is never
+        # older than the version it is stored under.
+        version = get_data_version(self.db, user_id)
+        cached = balance_summary_cache.get(str(user_id))
+        if cached is not None and cached[0] == version:
+            return [(balance_currency, Decimal(balance)) for balance_currency, balance in cached[1]]
+
+        balances = [(row.currency, row.balance) for row in self.repo.get_balances_by_currency(user_id)]
+        balance_summary_cache.set(
+            str(user_id),
+            [version, [[balance_currency, str(balance)] for balance_currency, balance in balances]],
+        )
+        return balances
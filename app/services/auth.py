@@ -1,28 +1,51 @@
+import secrets
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
 
+from app.core.cache import create_cache
 from app.core.config import settings
-from app.core.database import get_db
-from app.repositories.user import UserRepository
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.core.hashing import password_hasher
+from app.repositories.refresh_token import AsyncRefreshTokenRepository, RefreshTokenRepository
+from app.repositories.user import AsyncUserRepository, UserRepository
 from app.schemas.user import TokenData
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 security = HTTPBearer()
+principal_cache = create_cache(
+    "principal",
+    settings.PRINCIPAL_CACHE_MAX_SIZE,
+    settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+# Families revoked by logout, reuse detection or a password change. Access
+# tokens carry their family id, so they stop working immediately instead of at
+# expiry; entries only need to outlive the access tokens themselves. A miss is
+# answered from refresh_tokens and the result cached, active families only for
+# ACTIVE_TOKEN_FAMILY_CACHE_TTL_SECONDS, so revocations made on another worker,
+# before a restart or evicted from the LRU still take effect.
+revoked_family_cache = create_cache(
+    "revoked-token-family",
+    settings.REVOKED_TOKEN_CACHE_MAX_SIZE,
+    settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+REFRESH_TOKEN_TYPE = "refresh"
 
 
 class AuthService:
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        return (await password_hasher.verify_and_update(plain_password, hashed_password))[0]
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+    async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+    @staticmethod
+    async def get_password_hash(password: str) -> str:
+        return await password_hasher.hash(password)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -35,17 +58,35 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
+    @staticmethod
+    def create_refresh_token(user_id: int, jti: str, family_id: str, expires_at: datetime) -> str:
+        to_encode = {"sub": str(user_id), "jti": jti, "fam": family_id, "type": REFRESH_TOKEN_TYPE, "exp": expires_at}
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+    @staticmethod
+    def decode_refresh_token(token: str) -> dict:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            payload = {}
+        if payload.get("type") != REFRESH_TOKEN_TYPE or not payload.get("jti") or not payload.get("sub"):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+        return payload
+
     @staticmethod
     def decode_token(token: str) -> TokenData:
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
             user_id: int = payload.get("sub")
-            if user_id is None:
+            if user_id is None or payload.get("type") == REFRESH_TOKEN_TYPE:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Could not validate credentials"
                 )
-            return TokenData(user_id=int(user_id))
+            return TokenData(user_id=int(user_id), family_id=payload.get("fam"))
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,18 +94,78 @@ class AuthService:
             )
 
 
+def _user_exists(user_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return UserRepository(db).get_by_id(user_id) is not None
+    finally:
+        db.close()
+
+
+async def _user_exists_async(user_id: int) -> bool:
+    async with AsyncSessionLocal() as db:
+        return await AsyncUserRepository(db).get_by_id(user_id) is not None
+
+
+def _family_revoked(family_id: str) -> bool:
+    db = SessionLocal()
+    try:
+        return RefreshTokenRepository(db).is_family_revoked(family_id)
+    finally:
+        db.close()
+
+
+async def _family_revoked_async(family_id: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        return await AsyncRefreshTokenRepository(db).is_family_revoked(family_id)
+
+
+async def is_family_revoked(family_id: str) -> bool:
+    revoked = revoked_family_cache.get(family_id)
+    if revoked is None:
+        if AsyncSessionLocal is not None:
+            revoked = await _family_revoked_async(family_id)
+        else:
+            revoked = await run_in_threadpool(_family_revoked, family_id)
+        revoked_family_cache.set(family_id, revoked, None if revoked else settings.ACTIVE_TOKEN_FAMILY_CACHE_TTL_SECONDS)
+    return revoked
+
+
 async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
 ) -> int:
     token = credentials.credentials
     token_data = AuthService.decode_token(token)
+    if token_data.family_id and await is_family_revoked(token_data.family_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+    cache_key = str(token_data.user_id)
+    if principal_cache.get(cache_key):
+        return token_data.user_id
     
-    user_repo = UserRepository(db)
-    user = user_repo.get_by_id(token_data.user_id)
-    if user is None:
+    if AsyncSessionLocal is not None:
+        exists = await _user_exists_async(token_data.user_id)
+    else:
+        exists = await run_in_threadpool(_user_exists, token_data.user_id)
+    if not exists:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    return user.id
\ No newline at end of file
+    principal_cache.set(cache_key, True)
+    return token_data.user_id
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key"
+        )
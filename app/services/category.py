@@ -1,18 +1,25 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from typing import List, Optional
+from datetime import date
+from decimal import Decimal
 
 from app.repositories.category import CategoryRepository
-from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithBalance
+from app.repositories.category_total import CategoryTotalRepository
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.models.category import CategoryType
+from app.services.data_version import user_data_write
 
 
 class CategoryService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = CategoryRepository(db)
+        self.total_repo = CategoryTotalRepository(db)
 
     def create_category(self, user_id: int, category: CategoryCreate) -> CategoryResponse:
-        db_category = self.repo.create(user_id, category)
+        with user_data_write(self.db, user_id):
+            db_category = self.repo.create(user_id, category, commit=False)
         return CategoryResponse.model_validate(db_category)
 
     def get_category(self, category_id: int, user_id: int) -> CategoryResponse:
@@ -35,15 +42,14 @@ class CategoryService:
     def get_categories_with_balances(
         self,
         user_id: int,
-        category_type: Optional[CategoryType] = None
-    ) -> List[CategoryWithBalance]:
-        results = self.repo.get_with_balances(user_id, category_type)
+        category_type: Optional[CategoryType] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[dict]:
+        totals = self.total_repo.get_totals(user_id, start_date, end_date)
         return [
-            CategoryWithBalance(
-                **CategoryResponse.model_validate(cat).model_dump(),
-                total_amount=float(total)
-            )
-            for cat, total in results
+            {**row._asdict(), "total_amount": totals.get(row.id, Decimal(0))}
+            for row in self.repo.get_rows(user_id, category_type)
         ]
 
     def update_category(
@@ -52,18 +58,21 @@ class CategoryService:
         user_id: int, 
         category_update: CategoryUpdate
     ) -> CategoryResponse:
-        category = self.repo.update(category_id, user_id, category_update)
-        if not category:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Category not found"
-            )
+        with user_data_write(self.db, user_id):
+            category = self.repo.update(category_id, user_id, category_update, commit=False)
+            if not category:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Category not found"
+                )
         return CategoryResponse.model_validate(category)
 
     def delete_category(self, category_id: int, user_id: int) -> bool:
-        if not self.repo.delete(category_id, user_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Category not found"
-            )
+        with user_data_write(self.db, user_id):
+            if not self.repo.delete(category_id, user_id, commit=False):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Category not found"
+                )
+            self.total_repo.delete_for_category(category_id)
         return True
\ No newline at end of file
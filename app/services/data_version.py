@@ -0,0 +1,98 @@
+import hashlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.cache import MemoryCache, create_cache
+from app.core.config import settings
+from app.core.database import get_db, unit_of_work
+from app.core.serialization import FastJSONResponse, dumps
+from app.repositories.user import UserRepository
+from app.services.auth import get_current_user_id
+
+data_version_cache = create_cache(
+    "data-version",
+    settings.DATA_VERSION_CACHE_MAX_SIZE,
+    settings.DATA_VERSION_CACHE_TTL_SECONDS,
+)
+# Entries are keyed by data version, so a write never has to invalidate them;
+# superseded versions simply age out of the LRU.
+response_cache = MemoryCache(settings.RESPONSE_CACHE_MAX_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    cache_key = str(user_id)
+    version = data_version_cache.get(cache_key)
+    if version is None:
+        version = UserRepository(db).get_data_version(user_id) or 0
+        data_version_cache.set(cache_key, version)
+    return version
+
+
+@contextmanager
+def user_data_write(db: Session, user_id: int):
+    with unit_of_work(db):
+        yield db
+        # Bumped last so the user row lock is held only until the commit.
+        UserRepository(db).bump_data_version(user_id)
+    data_version_cache.delete(str(user_id))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    return etag.removeprefix("W/") in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+class ConditionalGet:
+    def __init__(self, request: Request, response: Response, user_id: int, version: str):
+        self.request = request
+        self.response = response
+        self.etag = f'W/"{user_id}.{version}"'
+        query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+        digest = hashlib.sha1(f"{request.scope['route'].path}?{query}".encode()).hexdigest()
+        self.cache_key = f"{user_id}:{version}:{digest}"
+        self.headers: Dict[str, str] = {"ETag": self.etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+    # With fast=True, build() must return data already shaped like the
+    # route's response_model; it is encoded as-is instead of being validated.
+    def respond(self, build: Callable[[], Any], fast: bool = False) -> Any:
+        cached: Optional[tuple] = response_cache.get(self.cache_key)
+        if cached is not None:
+            body, headers = cached
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        result = build()
+        if settings.RESPONSE_CACHE_MAX_SIZE <= 0:
+            if fast:
+                return FastJSONResponse(content=result, headers=self.headers)
+            self.response.headers.update(self.headers)
+            return result
+
+        body = dumps(result if fast else jsonable_encoder(result))
+        response_cache.set(self.cache_key, (body, dict(self.headers)))
+        return Response(content=body, media_type="application/json", headers=self.headers)
+
+
+def check_not_modified(conditional: ConditionalGet) -> ConditionalGet:
+    if_none_match = conditional.request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, conditional.etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=conditional.headers
+        )
+    return conditional
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> ConditionalGet:
+    version = str(get_data_version(db, current_user_id))
+    return check_not_modified(ConditionalGet(request, response, current_user_id, version))
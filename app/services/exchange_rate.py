@@ -0,0 +1,90 @@
+import csv
+import hashlib
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.core.database import get_db, unit_of_work
+from app.core.money import quantize
+from app.repositories.exchange_rate import ExchangeRateRepository
+from app.schemas.exchange_rate import validate_rates
+from app.services.auth import get_current_user_id
+from app.services.data_version import ConditionalGet, check_not_modified, get_data_version
+
+# The whole table is one entry: it is small, read on every converted total
+# and only changes through set_rates().
+rate_cache = create_cache("exchange-rates", 1, settings.EXCHANGE_RATE_CACHE_TTL_SECONDS)
+RATES_KEY = "rates"
+
+
+def load_rates_file(path: str) -> Dict[str, Decimal]:
+    with open(path, newline="") as file:
+        if path.lower().endswith(".csv"):
+            raw = {row["currency"].strip(): row["rate"].strip() for row in csv.DictReader(file)}
+        else:
+            raw = json.load(file)
+    try:
+        rates = {currency: Decimal(str(rate)) for currency, rate in raw.items()}
+    except (InvalidOperation, AttributeError):
+        raise ValueError(f"{path}: rates must be a currency -> number mapping")
+    return validate_rates(rates)
+
+
+class ExchangeRateService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = ExchangeRateRepository(db)
+
+    # Rates are kept as strings so the cached entry is also valid JSON for a
+    # shared cache backend.
+    def get_rates(self) -> Dict[str, str]:
+        rates = rate_cache.get(RATES_KEY)
+        if rates is None:
+            rates = {currency: str(rate) for currency, rate in self.repo.get_all().items()}
+            rates[settings.BASE_CURRENCY] = "1"
+            rate_cache.set(RATES_KEY, rates)
+        return rates
+
+    def set_rates(self, rates: Dict[str, Decimal]) -> Dict[str, str]:
+        with unit_of_work(self.db):
+            self.repo.upsert({currency: rate for currency, rate in rates.items() if currency != settings.BASE_CURRENCY})
+        rate_cache.delete(RATES_KEY)
+        return self.get_rates()
+
+    @staticmethod
+    def rates_version(rates: Dict[str, str]) -> str:
+        return hashlib.sha1(json.dumps(rates, sort_keys=True).encode()).hexdigest()[:12]
+
+    def convert_total(self, balances: Iterable[Tuple[str, Decimal]], currency: str) -> Tuple[Decimal, List[str]]:
+        rates = self.get_rates()
+        if currency not in rates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No exchange rate for {currency}"
+            )
+        total = Decimal(0)
+        unconverted = []
+        for balance_currency, balance in balances:
+            rate = rates.get(balance_currency)
+            if rate is None:
+                unconverted.append(balance_currency)
+                continue
+            total += balance * Decimal(rate)
+        return quantize(total / Decimal(rates[currency])), unconverted
+
+
+# Converted totals change when the rates do, so their ETag covers both.
+def conditional_get_with_rates(
+    request: Request,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> ConditionalGet:
+    rates_version = ExchangeRateService.rates_version(ExchangeRateService(db).get_rates())
+    version = f"{get_data_version(db, current_user_id)}.{rates_version}"
+    return check_not_modified(ConditionalGet(request, response, current_user_id, version))
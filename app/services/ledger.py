@@ -0,0 +1,73 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.sql import month_start
+from app.models.category import CategoryType
+from app.repositories.account import AccountRepository
+from app.repositories.category_total import CategoryTotalRepository
+
+
+class BalanceLedger:
+    def __init__(self, db: Session, user_id: int):
+        self.user_id = user_id
+        self.account_repo = AccountRepository(db)
+        self.category_total_repo = CategoryTotalRepository(db)
+        self.deltas: Dict[int, Decimal] = defaultdict(Decimal)
+        self.category_deltas: Dict[Tuple[int, date], List] = defaultdict(lambda: [Decimal(0), 0])
+
+    @staticmethod
+    def signed_amount(category_type: CategoryType, amount: Decimal) -> Decimal:
+        return -amount if category_type == CategoryType.EXPENSE else amount
+
+    def _record(
+        self,
+        sign: int,
+        account_id: int,
+        category_id: int,
+        category_type: CategoryType,
+        amount: Decimal,
+        operation_date: datetime,
+    ) -> None:
+        self.deltas[account_id] += sign * self.signed_amount(category_type, amount)
+        category_delta = self.category_deltas[(category_id, month_start(operation_date))]
+        category_delta[0] += sign * amount
+        category_delta[1] += sign
+
+    def apply(
+        self,
+        account_id: int,
+        category_id: int,
+        category_type: CategoryType,
+        amount: Decimal,
+        operation_date: datetime,
+    ) -> None:
+        self._record(1, account_id, category_id, category_type, amount, operation_date)
+
+    def revert(
+        self,
+        account_id: int,
+        category_id: int,
+        category_type: CategoryType,
+        amount: Decimal,
+        operation_date: datetime,
+    ) -> None:
+        self._record(-1, account_id, category_id, category_type, amount, operation_date)
+
+    def revert_account(self, account_id: int) -> None:
+        # Balances of a deleted account do not matter, only its share of the category totals.
+        for key, (amount, count) in self.category_total_repo.get_account_totals(account_id).items():
+            self.category_deltas[key][0] -= amount
+            self.category_deltas[key][1] -= count
+
+    def flush(self) -> None:
+        # Fixed lock order keeps concurrent multi-account writes from deadlocking.
+        for account_id, delta in sorted(self.deltas.items()):
+            if delta:
+                self.account_repo.update_balance(account_id, delta)
+        self.category_total_repo.apply_deltas(self.user_id, self.category_deltas)
+        self.deltas.clear()
+        self.category_deltas.clear()
@@ -1,17 +1,26 @@
+import re
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import date
 
+from app.core.pagination import decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from app.core.serialization import dumps
 from app.repositories.operation import OperationRepository
 from app.repositories.account import AccountRepository
 from app.repositories.category import CategoryRepository
-from app.schemas.operation import OperationCreate, OperationUpdate, OperationResponse, OperationWithDetails
-from app.models.category import CategoryType
+from app.schemas.operation import OperationCreate, OperationUpdate, OperationResponse
+from app.services.data_version import user_data_write
+from app.services.ledger import BalanceLedger
+
+MAX_SEARCH_TERMS = 8
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
 
 
 class OperationService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = OperationRepository(db)
         self.account_repo = AccountRepository(db)
         self.category_repo = CategoryRepository(db)
@@ -31,12 +40,17 @@ class OperationService:
                 detail="Category not found"
             )
 
-        db_operation = self.repo.create(user_id, operation)
-
-        if category.type == CategoryType.EXPENSE:
-            self.account_repo.update_balance(operation.account_id, -operation.amount)
-        else:  
-            self.account_repo.update_balance(operation.account_id, operation.amount)
+        with user_data_write(self.db, user_id):
+            db_operation = self.repo.create(user_id, operation, commit=False)
+            ledger = BalanceLedger(self.db, user_id)
+            ledger.apply(
+                db_operation.account_id,
+                db_operation.category_id,
+                category.type,
+                db_operation.amount,
+                db_operation.operation_date,
+            )
+            ledger.flush()
 
         return OperationResponse.model_validate(db_operation)
 
@@ -55,10 +69,60 @@ class OperationService:
         account_id: Optional[int] = None,
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
-    ) -> List[OperationResponse]:
-        operations = self.repo.get_all(user_id, account_id, category_id, start_date, end_date)
-        return [OperationResponse.model_validate(op) for op in operations]
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[OperationResponse], Optional[str]]:
+        operations = self.repo.get_all(
+            user_id, account_id, category_id, start_date, end_date,
+            cursor=decode_cursor(cursor),
+            limit=limit + 1 if limit else None,
+        )
+        operations, next_cursor = self._paginate(operations, limit)
+        return [OperationResponse.model_validate(op) for op in operations], next_cursor
+
+    def get_operation_rows(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        rows = self.repo.get_rows(
+            user_id, account_id, category_id, start_date, end_date,
+            cursor=decode_cursor(cursor),
+            limit=limit + 1 if limit else None,
+        )
+        rows, next_cursor = self._paginate(rows, limit)
+        return [row._asdict() for row in rows], next_cursor
+
+    def stream_operations(
+        self,
+        user_id: int,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        # Decoded before the generator starts so a bad cursor is still a 400:
+        # once the streaming response has started its status is already sent.
+        decoded_cursor = decode_cursor(cursor)
+
+        def lines() -> Iterator[bytes]:
+            rows = self.repo.iter_rows(
+                user_id, account_id, category_id, start_date, end_date,
+                cursor=decoded_cursor,
+                limit=limit,
+            )
+            for row in rows:
+                yield dumps(row._asdict()) + b"\n"
+
+        return lines()
 
     def get_operations_with_details(
         self,
@@ -66,18 +130,55 @@ class OperationService:
         account_id: Optional[int] = None,
         category_id: Optional[int] = None,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
-    ) -> List[OperationWithDetails]:
-        results = self.repo.get_with_details(user_id, account_id, category_id, start_date, end_date)
-        return [
-            OperationWithDetails(
-                **OperationResponse.model_validate(op).model_dump(),
-                account_name=acc_name,
-                category_name=cat_name,
-                category_type=cat_type.value
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        rows = self.repo.get_with_details(
+            user_id, account_id, category_id, start_date, end_date,
+            cursor=decode_cursor(cursor),
+            limit=limit + 1 if limit else None,
+        )
+        rows, next_cursor = self._paginate(rows, limit)
+        return [row._asdict() for row in rows], next_cursor
+
+    def search_operations(
+        self,
+        user_id: int,
+        q: str,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[dict], Optional[str]]:
+        # Only word characters reach the match expression, so user input can
+        # never be parsed as tsquery/FTS5 operators.
+        terms = SEARCH_TERM_PATTERN.findall(q.lower())[:MAX_SEARCH_TERMS]
+        if not terms:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must contain at least one word"
             )
-            for op, acc_name, cat_name, cat_type in results
-        ]
+        rows = self.repo.search(
+            user_id, terms, account_id, category_id, start_date, end_date,
+            cursor=decode_rank_cursor(cursor),
+            limit=limit + 1,
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].id)
+        return [row._asdict() for row in rows], next_cursor
+
+    @staticmethod
+    def _paginate(rows: list, limit: Optional[int]) -> Tuple[list, Optional[str]]:
+        if not limit or len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(last.operation_date, last.id)
 
     def update_operation(
         self,
@@ -85,36 +186,52 @@ class OperationService:
         user_id: int,
         operation_update: OperationUpdate
     ) -> OperationResponse:
-        old_operation = self.repo.get_by_id(operation_id, user_id)
+        old_operation = self.repo.get_by_id(operation_id, user_id, for_update=True)
         if not old_operation:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Operation not found"
             )
 
+        old_account_id = old_operation.account_id
+        old_category_id = old_operation.category_id
+        old_amount = old_operation.amount
+        old_operation_date = old_operation.operation_date
         old_category = self.category_repo.get_by_id(old_operation.category_id, user_id)
 
-        if old_category.type == CategoryType.EXPENSE:
-            self.account_repo.update_balance(old_operation.account_id, old_operation.amount)
-        else:
-            self.account_repo.update_balance(old_operation.account_id, -old_operation.amount)
-
-        updated_operation = self.repo.update(operation_id, user_id, operation_update)
-
-        new_account_id = operation_update.account_id or old_operation.account_id
-        new_category_id = operation_update.category_id or old_operation.category_id
-        new_amount = operation_update.amount or old_operation.amount
-
-        new_category = self.category_repo.get_by_id(new_category_id, user_id)
-        if new_category.type == CategoryType.EXPENSE:
-            self.account_repo.update_balance(new_account_id, -new_amount)
-        else:
-            self.account_repo.update_balance(new_account_id, new_amount)
+        new_category = old_category
+        if operation_update.category_id is not None and operation_update.category_id != old_category.id:
+            new_category = self.category_repo.get_by_id(operation_update.category_id, user_id)
+            if not new_category:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Category not found"
+                )
+
+        if operation_update.account_id is not None and operation_update.account_id != old_account_id:
+            if not self.account_repo.get_by_id(operation_update.account_id, user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Account not found"
+                )
+
+        with user_data_write(self.db, user_id):
+            ledger = BalanceLedger(self.db, user_id)
+            ledger.revert(old_account_id, old_category_id, old_category.type, old_amount, old_operation_date)
+            updated_operation = self.repo.update(operation_id, user_id, operation_update, commit=False)
+            ledger.apply(
+                updated_operation.account_id,
+                updated_operation.category_id,
+                new_category.type,
+                updated_operation.amount,
+                updated_operation.operation_date,
+            )
+            ledger.flush()
 
         return OperationResponse.model_validate(updated_operation)
 
     def delete_operation(self, operation_id: int, user_id: int) -> bool:
-        operation = self.repo.get_by_id(operation_id, user_id)
+        operation = self.repo.get_by_id(operation_id, user_id, for_update=True)
         if not operation:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -122,11 +239,16 @@ class OperationService:
             )
 
         category = self.category_repo.get_by_id(operation.category_id, user_id)
-        
-        if category.type == CategoryType.EXPENSE:
-            self.account_repo.update_balance(operation.account_id, operation.amount)
-        else:
-            self.account_repo.update_balance(operation.account_id, -operation.amount)
 
-        self.repo.delete(operation_id, user_id)
+        with user_data_write(self.db, user_id):
+            ledger = BalanceLedger(self.db, user_id)
+            ledger.revert(
+                operation.account_id,
+                operation.category_id,
+                category.type,
+                operation.amount,
+                operation.operation_date,
+            )
+            ledger.flush()
+            self.repo.delete(operation_id, user_id, commit=False)
         return True
\ No newline at end of file
@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.models.category import CategoryType
+from app.models.operation import Operation
+from app.repositories.account import AccountRepository
+from app.repositories.category import CategoryRepository
+from app.repositories.operation import OperationRepository
+from app.schemas.operation import (
+    OperationBatchCreate,
+    OperationBatchDelete,
+    OperationBatchItem,
+    OperationBatchItemResult,
+    OperationBatchRequest,
+    OperationBatchResult,
+    OperationBatchUpdate,
+    OperationResponse,
+)
+from app.services.data_version import user_data_write
+from app.services.ledger import BalanceLedger
+
+
+class OperationBatchService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = OperationRepository(db)
+        self.account_repo = AccountRepository(db)
+        self.category_repo = CategoryRepository(db)
+
+    @staticmethod
+    def _check(
+        item: OperationBatchItem,
+        operations: Dict[int, Operation],
+        account_ids: Set[int],
+        category_types: Dict[int, CategoryType],
+    ) -> Optional[str]:
+        if not isinstance(item, OperationBatchCreate) and item.id not in operations:
+            return "Operation not found"
+        if isinstance(item, OperationBatchDelete):
+            return None
+        if item.account_id is not None and item.account_id not in account_ids:
+            return "Account not found"
+        if item.category_id is not None and item.category_id not in category_types:
+            return "Category not found"
+        return None
+
+    def apply_batch(self, user_id: int, batch: OperationBatchRequest) -> OperationBatchResult:
+        items = batch.items
+        operation_ids = {item.id for item in items if not isinstance(item, OperationBatchCreate)}
+        results: List[OperationBatchItemResult] = []
+        applied = []
+        created: List[Tuple[OperationBatchItemResult, OperationBatchCreate]] = []
+
+        with user_data_write(self.db, user_id):
+            operations = self.repo.get_by_ids(operation_ids, user_id, for_update=True) if operation_ids else {}
+            # One lookup each for every account and category the batch touches,
+            # including the categories of the operations being changed.
+            account_ids = {
+                item.account_id for item in items
+                if not isinstance(item, OperationBatchDelete) and item.account_id is not None
+            }
+            category_ids = {
+                item.category_id for item in items
+                if not isinstance(item, OperationBatchDelete) and item.category_id is not None
+            } | {operation.category_id for operation in operations.values()}
+            account_ids = self.account_repo.get_existing_ids(user_id, account_ids) if account_ids else set()
+            category_types = self.category_repo.get_types(user_id, category_ids) if category_ids else {}
+
+            ledger = BalanceLedger(self.db, user_id)
+            for index, item in enumerate(items):
+                error = self._check(item, operations, account_ids, category_types)
+                if error:
+                    results.append(OperationBatchItemResult(
+                        index=index, action=item.action, status=status.HTTP_404_NOT_FOUND, error=error
+                    ))
+                    continue
+
+                if isinstance(item, OperationBatchCreate):
+                    ledger.apply(
+                        item.account_id,
+                        item.category_id,
+                        category_types[item.category_id],
+                        item.amount,
+                        item.operation_date,
+                    )
+                    result = OperationBatchItemResult(index=index, action=item.action, status=status.HTTP_201_CREATED)
+                    results.append(result)
+                    created.append((result, item))
+                    continue
+
+                db_operation = operations[item.id]
+                ledger.revert(
+                    db_operation.account_id,
+                    db_operation.category_id,
+                    category_types[db_operation.category_id],
+                    db_operation.amount,
+                    db_operation.operation_date,
+                )
+                if isinstance(item, OperationBatchUpdate):
+                    self.repo.apply_update(db_operation, item)
+                    ledger.apply(
+                        db_operation.account_id,
+                        db_operation.category_id,
+                        category_types[db_operation.category_id],
+                        db_operation.amount,
+                        db_operation.operation_date,
+                    )
+                    result_status = status.HTTP_200_OK
+                else:
+                    del operations[item.id]
+                    self.db.delete(db_operation)
+                    result_status = status.HTTP_204_NO_CONTENT
+                result = OperationBatchItemResult(index=index, action=item.action, status=result_status)
+                results.append(result)
+                applied.append((result, db_operation))
+
+            if batch.atomic and len(applied) + len(created) < len(items):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=[result.model_dump(exclude_none=True) for result in results if result.error]
+                )
+
+            # Creates go out as multi-row INSERTs; updates and deletes are
+            # grouped into executemany batches by the unit of work.
+            self.db.flush()
+            rows = self.repo.bulk_create(user_id, [item for _, item in created], returning=True)
+            ledger.flush()
+            for (result, _), row in zip(created, rows):
+                result.operation = OperationResponse.model_validate(row)
+            for result, db_operation in applied:
+                if result.action == "update":
+                    result.operation = OperationResponse.model_validate(db_operation)
+
+        succeeded = len(applied) + len(created)
+        return OperationBatchResult(applied=succeeded, failed=len(items) - succeeded, results=results)
@@ -0,0 +1,274 @@
+import codecs
+import csv
+import io
+import json
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.money import MINOR_UNIT_DIGITS, MONEY_PRECISION
+from app.core.serialization import dumps
+from app.repositories.account import AccountRepository
+from app.repositories.category import CategoryRepository
+from app.repositories.operation import OperationRepository
+from app.schemas.operation import OperationCreate, OperationImportError, OperationImportResult
+from app.services.data_version import user_data_write
+from app.services.ledger import BalanceLedger
+
+IMPORT_FORMATS = ("csv", "json", "ndjson")
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_import_format(filename: str, content_type: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    if extension == "jsonl":
+        extension = "ndjson"
+    if extension in IMPORT_FORMATS:
+        return extension
+    if content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    if content_type == "application/json":
+        return "json"
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Could not detect import format, pass format=csv|json|ndjson"
+    )
+
+
+def _read_csv(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def _read_ndjson(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    for row_number, line in enumerate(file, start=1):
+        if line.strip():
+            yield row_number, json.loads(line)
+
+
+def _read_json(file: BinaryIO) -> Iterator[Tuple[int, dict]]:
+    records = json.load(file)
+    if not isinstance(records, list):
+        raise ValueError("JSON import must be an array of operations")
+    yield from enumerate(records, start=1)
+
+
+READERS = {
+    "csv": _read_csv,
+    "json": _read_json,
+    "ndjson": _read_ndjson,
+}
+
+
+class OperationImportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = OperationRepository(db)
+        self.account_repo = AccountRepository(db)
+        self.category_repo = CategoryRepository(db)
+
+    def import_operations(self, user_id: int, file: BinaryIO, import_format: str) -> OperationImportResult:
+        account_ids = {account.id for account in self.account_repo.get_all(user_id)}
+        category_types = {category.id: category.type for category in self.category_repo.get_all(user_id)}
+
+        result = OperationImportResult(total_rows=0, imported=0, failed=0)
+        ledger = BalanceLedger(self.db, user_id)
+        batch: List[OperationCreate] = []
+
+        def fail(row_number: int, error: str) -> None:
+            result.failed += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(OperationImportError(row=row_number, error=error))
+
+        with user_data_write(self.db, user_id):
+            try:
+                for row_number, record in READERS[import_format](file):
+                    result.total_rows += 1
+                    try:
+                        operation = OperationCreate.model_validate(record)
+                    except ValidationError as e:
+                        fail(row_number, "; ".join(
+                            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                            for error in e.errors()
+                        ))
+                        continue
+
+                    if operation.account_id not in account_ids:
+                        fail(row_number, "Account not found")
+                        continue
+                    if operation.category_id not in category_types:
+                        fail(row_number, "Category not found")
+                        continue
+
+                    batch.append(operation)
+                    ledger.apply(
+                        operation.account_id,
+                        operation.category_id,
+                        category_types[operation.category_id],
+                        operation.amount,
+                        operation.operation_date,
+                    )
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        self.repo.bulk_create(user_id, batch)
+                        result.imported += len(batch)
+                        batch = []
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Malformed {import_format} file at row {result.total_rows + 1}: {e}"
+                )
+
+            self.repo.bulk_create(user_id, batch)
+            result.imported += len(batch)
+            ledger.flush()
+
+        return result
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_COLUMNS = (
+    "id",
+    "account_id",
+    "account_name",
+    "category_id",
+    "category_name",
+    "category_type",
+    "amount",
+    "description",
+    "operation_date",
+    "created_at",
+    "updated_at",
+)
+EXPORT_CHUNK_SIZE = 1000
+PARQUET_ROW_GROUP_SIZE = 50000
+
+
+def _export_record(row) -> dict:
+    record = dict(row._mapping)
+    record["category_type"] = record["category_type"].value
+    return record
+
+
+def _write_csv(rows) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in _chunked(rows, EXPORT_CHUNK_SIZE):
+        for row in chunk:
+            record = _export_record(row)
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in (record[column] for column in EXPORT_COLUMNS)
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _write_ndjson(rows) -> Iterator[bytes]:
+    for chunk in _chunked(rows, EXPORT_CHUNK_SIZE):
+        yield b"".join(dumps(_export_record(row)) + b"\n" for row in chunk)
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _write_parquet(rows) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("account_id", pa.int64()),
+        ("account_name", pa.string()),
+        ("category_id", pa.int64()),
+        ("category_name", pa.string()),
+        ("category_type", pa.string()),
+        ("amount", pa.decimal128(MONEY_PRECISION, MINOR_UNIT_DIGITS)),
+        ("description", pa.string()),
+        ("operation_date", pa.timestamp("us")),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    for chunk in _chunked(rows, PARQUET_ROW_GROUP_SIZE):
+        writer.write_table(pa.Table.from_pylist([_export_record(row) for row in chunk], schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+WRITERS = {
+    "csv": _write_csv,
+    "ndjson": _write_ndjson,
+    "parquet": _write_parquet,
+}
+
+
+def _chunked(rows, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class OperationExportService:
+    def __init__(self, db: Session):
+        self.repo = OperationRepository(db)
+
+    def export_operations(
+        self,
+        user_id: int,
+        export_format: str,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> Iterator[bytes]:
+        if export_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise HTTPException(
+                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                    detail="Parquet export requires the 'pyarrow' package"
+                )
+
+        rows = self.repo.stream_with_details(user_id, account_id, category_id, start_date, end_date)
+        return WRITERS[export_format](rows)
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, unit_of_work
+from app.models.user import User
+from app.repositories.account import AccountRepository
+from app.repositories.job_checkpoint import JobCheckpointRepository
+from app.repositories.user import UserRepository
+from app.schemas.reconciliation import AccountDiscrepancy, ReconciliationReport
+from app.services.data_version import data_version_cache
+
+RECONCILE_JOB = "reconcile-balances"
+
+
+class ReconciliationService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.account_repo = AccountRepository(db)
+        self.user_repo = UserRepository(db)
+
+    def reconcile_users(self, first_user_id: int, last_user_id: int, fix: bool) -> Tuple[int, List[AccountDiscrepancy]]:
+        rows = self.account_repo.get_expected_balances(first_user_id, last_user_id)
+        discrepancies = []
+        for row in rows:
+            if row.balance == row.expected:
+                continue
+            fixed = fix and self.account_repo.set_balance_if_unchanged(row.id, row.balance, row.expected)
+            discrepancies.append(AccountDiscrepancy(
+                account_id=row.id,
+                user_id=row.user_id,
+                stored=row.balance,
+                expected=row.expected,
+                fixed=fixed,
+            ))
+        for user_id in sorted({d.user_id for d in discrepancies if d.fixed}):
+            self.user_repo.bump_data_version(user_id)
+        return len(rows), discrepancies
+
+
+def _user_chunks(first_user_id: int, last_user_id: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [
+        (chunk_start, min(chunk_start + chunk_size - 1, last_user_id))
+        for chunk_start in range(first_user_id, last_user_id + 1, chunk_size)
+    ]
+
+
+def reconcile_chunk(job: str, chunk_start: int, fix: bool, batch_size: int) -> List[AccountDiscrepancy]:
+    db = SessionLocal()
+    try:
+        checkpoints = JobCheckpointRepository(db)
+        checkpoint = checkpoints.get(job, chunk_start)
+        service = ReconciliationService(db)
+        found = []
+        cursor = checkpoint.last_user_id if checkpoint.last_user_id is not None else chunk_start - 1
+        # One short transaction per batch of users, committed together with
+        # the checkpoint, so an interrupted run resumes after the last batch.
+        while cursor < checkpoint.chunk_end:
+            batch_end = min(cursor + batch_size, checkpoint.chunk_end)
+            with unit_of_work(db):
+                checked, discrepancies = service.reconcile_users(cursor + 1, batch_end, fix)
+                checkpoints.advance(
+                    checkpoint,
+                    batch_end,
+                    checked,
+                    len(discrepancies),
+                    sum(1 for d in discrepancies if d.fixed),
+                )
+            for user_id in {d.user_id for d in discrepancies if d.fixed}:
+                data_version_cache.delete(str(user_id))
+            found.extend(discrepancies)
+            cursor = batch_end
+        return found
+    finally:
+        db.close()
+
+
+def run_reconciliation(
+    job: str = RECONCILE_JOB,
+    fix: bool = False,
+    workers: int = 4,
+    chunk_size: int = 10000,
+    batch_size: int = 500,
+    restart: bool = False,
+) -> ReconciliationReport:
+    db = SessionLocal()
+    try:
+        checkpoints = JobCheckpointRepository(db)
+        existing = checkpoints.get_all(job)
+        # A finished run is not resumed; the next one starts over.
+        if restart or (existing and all(cp.completed_at for cp in existing.values())):
+            checkpoints.delete(job)
+            existing = {}
+        covered = max((cp.chunk_end for cp in existing.values()), default=0)
+        last_user_id = db.query(func.max(User.id)).scalar() or 0
+        checkpoints.create_missing(job, _user_chunks(covered + 1, last_user_id, chunk_size))
+        pending = sorted(start for start, cp in checkpoints.get_all(job).items() if not cp.completed_at)
+    finally:
+        db.close()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reconcile") as pool:
+        results = pool.map(partial(reconcile_chunk, job, fix=fix, batch_size=batch_size), pending)
+        found = [discrepancy for chunk in results for discrepancy in chunk]
+
+    db = SessionLocal()
+    try:
+        totals = list(JobCheckpointRepository(db).get_all(job).values())
+    finally:
+        db.close()
+    return ReconciliationReport(
+        job=job,
+        chunks=len(totals),
+        accounts_checked=sum(cp.accounts_checked for cp in totals),
+        discrepancies=sum(cp.discrepancies for cp in totals),
+        fixed=sum(cp.fixed for cp in totals),
+        found=found,
+    )
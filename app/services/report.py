@@ -0,0 +1,84 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Dict, List, Optional
+from datetime import date
+from decimal import Decimal
+
+from app.core.sql import to_date
+from app.models.category import CategoryType
+from app.repositories.report import ReportRepository
+from app.schemas.report import AccountCashFlow, CategoryBreakdown, ReportBucket, TimeSeriesPoint
+
+
+class ReportService:
+    def __init__(self, db: Session):
+        self.repo = ReportRepository(db)
+
+    @staticmethod
+    def _check_range(start_date: Optional[date], end_date: Optional[date]) -> None:
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date must not be after end_date"
+            )
+
+    def get_time_series(
+        self,
+        user_id: int,
+        bucket: ReportBucket,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        account_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+    ) -> List[TimeSeriesPoint]:
+        self._check_range(start_date, end_date)
+        rows = self.repo.get_time_series(user_id, bucket.value, start_date, end_date, account_id, category_id)
+        return [
+            TimeSeriesPoint(period=to_date(period), income=income, expense=expense, net=income - expense)
+            for period, income, expense in rows
+        ]
+
+    def get_category_breakdown(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        account_id: Optional[int] = None,
+        category_type: Optional[CategoryType] = None,
+    ) -> List[CategoryBreakdown]:
+        self._check_range(start_date, end_date)
+        rows = self.repo.get_category_breakdown(user_id, start_date, end_date, account_id, category_type)
+        type_totals: Dict[CategoryType, Decimal] = {}
+        for _, _, cat_type, total, _ in rows:
+            type_totals[cat_type] = type_totals.get(cat_type, 0) + total
+        return [
+            CategoryBreakdown(
+                category_id=cat_id,
+                category_name=cat_name,
+                category_type=cat_type.value,
+                total=total,
+                count=count,
+                share=float(total / type_totals[cat_type]) if type_totals[cat_type] else 0.0,
+            )
+            for cat_id, cat_name, cat_type, total, count in rows
+        ]
+
+    def get_account_cash_flow(
+        self,
+        user_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[AccountCashFlow]:
+        self._check_range(start_date, end_date)
+        rows = self.repo.get_account_cash_flow(user_id, start_date, end_date)
+        return [
+            AccountCashFlow(
+                account_id=acc_id,
+                account_name=acc_name,
+                currency=currency,
+                income=income,
+                expense=expense,
+                net=income - expense,
+            )
+            for acc_id, acc_name, currency, income, expense in rows
+        ]
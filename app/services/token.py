@@ -0,0 +1,83 @@
+import secrets
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import unit_of_work
+from app.repositories.refresh_token import RefreshTokenRepository
+from app.schemas.user import Token
+from app.services.auth import AuthService, revoked_family_cache
+
+
+class TokenService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = RefreshTokenRepository(db)
+
+    def _issue(self, user_id: int, family_id: str) -> Token:
+        jti = secrets.token_hex(16)
+        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        self.repo.create(jti, family_id, user_id, expires_at, commit=False)
+        return Token(
+            access_token=AuthService.create_access_token(data={"sub": str(user_id), "fam": family_id}),
+            refresh_token=AuthService.create_refresh_token(user_id, jti, family_id, expires_at),
+            token_type="bearer",
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    def issue_tokens(self, user_id: int) -> Token:
+        with unit_of_work(self.db):
+            self.repo.delete_expired_for_user(user_id)
+            return self._issue(user_id, secrets.token_hex(16))
+
+    def refresh(self, refresh_token: str) -> Token:
+        claims = AuthService.decode_refresh_token(refresh_token)
+        if revoked_family_cache.get(claims.get("fam", "")):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+
+        with unit_of_work(self.db):
+            stored = self.repo.get_for_update(claims["jti"])
+            if stored is None or stored.user_id != int(claims["sub"]) or stored.expires_at <= datetime.utcnow():
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid refresh token"
+                )
+            # A token that was already rotated is being presented again: either
+            # the client or an attacker holds a stolen copy, so end the session.
+            reused = stored.revoked_at is not None
+            if reused:
+                self.repo.revoke_family(stored.family_id)
+            else:
+                self.repo.revoke(stored)
+                tokens = self._issue(stored.user_id, stored.family_id)
+
+        if reused:
+            self.mark_revoked([stored.family_id])
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh token reuse detected"
+            )
+        return tokens
+
+    def logout(self, refresh_token: str) -> None:
+        claims = AuthService.decode_refresh_token(refresh_token)
+        with unit_of_work(self.db):
+            stored = self.repo.get_for_update(claims["jti"])
+            if stored is None or stored.user_id != int(claims["sub"]):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid refresh token"
+                )
+            self.repo.revoke_family(stored.family_id)
+        self.mark_revoked([stored.family_id])
+
+    @staticmethod
+    def mark_revoked(family_ids: Iterable[str]) -> None:
+        for family_id in family_ids:
+            revoked_family_cache.set(family_id, True)
@@ -1,40 +1,71 @@
+from typing import List, Optional, Tuple
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
+from app.repositories.refresh_token import RefreshTokenRepository
 from app.repositories.user import UserRepository
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.services.auth import AuthService
+from app.services.auth import AuthService, principal_cache
+from app.services.token import TokenService
 
 
+# The methods that hash a password run their queries in the threadpool and
+# await the hasher in between. The read transaction is ended before hashing,
+# so neither a request thread nor a pooled connection is held while the hash
+# runs or waits for a hashing slot.
 class UserService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = UserRepository(db)
+        self.token_repo = RefreshTokenRepository(db)
         self.auth_service = AuthService()
-        
-    def create_user(self, user: UserCreate) -> UserResponse:
-        if self.repo.get_by_email(user.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        if self.repo.get_by_username(user.username):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
-            )
-            
-        hashed_password = self.auth_service.get_password_hash(user.password)
-        db_user = self.repo.create(user, hashed_password)
+
+    def _check_available(self, email: Optional[str], username: Optional[str], user_id: Optional[int] = None) -> None:
+        try:
+            if email:
+                existing = self.repo.get_by_email(email)
+                if existing and existing.id != user_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Email already registered"
+                    )
+            if username:
+                existing = self.repo.get_by_username(username)
+                if existing and existing.id != user_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Username already taken"
+                    )
+        finally:
+            self.db.rollback()
+
+    def _get_credentials(self, email: str) -> Optional[Tuple[int, str]]:
+        try:
+            user = self.repo.get_by_email(email)
+            return (user.id, user.hashed_password) if user else None
+        finally:
+            self.db.rollback()
+
+    async def create_user(self, user: UserCreate) -> UserResponse:
+        await run_in_threadpool(self._check_available, user.email, user.username)
+        hashed_password = await self.auth_service.get_password_hash(user.password)
+        db_user = await run_in_threadpool(self.repo.create, user, hashed_password)
         return UserResponse.model_validate(db_user)
-    
-    def authenticate_user(self, email: str, password: str):
-        user = self.repo.get_by_email(email)
-        if not user:
+
+    async def authenticate_user(self, email: str, password: str) -> Optional[int]:
+        credentials = await run_in_threadpool(self._get_credentials, email)
+        if not credentials:
             return None
-        if not self.auth_service.verify_password(password, user.hashed_password):
+        user_id, hashed_password = credentials
+        verified, new_hash = await self.auth_service.verify_and_update_password(password, hashed_password)
+        if not verified:
             return None
-        return user
-    
+        if new_hash:
+            await run_in_threadpool(self.repo.update_password_hash, user_id, new_hash)
+        return user_id
+
     def get_user(self, user_id: int) -> UserResponse:
         user = self.repo.get_by_id(user_id)
         if not user:
@@ -43,27 +74,12 @@ class UserService:
                 detail="User not found"
             )
         return UserResponse.model_validate(user)
-    
-    def update_user(self, user_id: int, user_update: UserUpdate) -> UserResponse:
-        if user_update.email:
-            existing = self.repo.get_by_email(user_update.email)
-            if existing and existing.id != user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Email already registered"
-                )
-        
-        if user_update.username:
-            existing = self.repo.get_by_username(user_update.username)
-            if existing and existing.id != user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Username already taken"
-                )
 
-        hashed_password = None
-        if user_update.password:
-            hashed_password = self.auth_service.get_password_hash(user_update.password)
+    def _save_update(self, user_id: int, user_update: UserUpdate, hashed_password: Optional[str]) -> UserResponse:
+        revoked_families: List[str] = []
+        if hashed_password:
+            # Committed together with the new hash by repo.update.
+            revoked_families = self.token_repo.revoke_all_for_user(user_id)
 
         user = self.repo.update(user_id, user_update, hashed_password)
         if not user:
@@ -71,12 +87,22 @@ class UserService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
+        principal_cache.delete(str(user_id))
+        TokenService.mark_revoked(revoked_families)
         return UserResponse.model_validate(user)
-    
+
+    async def update_user(self, user_id: int, user_update: UserUpdate) -> UserResponse:
+        await run_in_threadpool(self._check_available, user_update.email, user_update.username, user_id)
+        hashed_password = None
+        if user_update.password:
+            hashed_password = await self.auth_service.get_password_hash(user_update.password)
+        return await run_in_threadpool(self._save_update, user_id, user_update, hashed_password)
+
     def delete_user(self, user_id: int) -> bool:
         if not self.repo.delete(user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
-        return True
\ No newline at end of file
+        principal_cache.delete(str(user_id))
+        return True
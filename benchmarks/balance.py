@@ -0,0 +1,94 @@
+"""Compare the ways of computing a user's total balance.
+
+Seeds users with many accounts, then times building GET /accounts/balance
+three ways: hydrating every Account and summing in Python (the original
+path), one SQL aggregate grouped by currency, and the per-user summary cache
+keyed by data version:
+
+    python -m benchmarks.balance --accounts-per-user 200
+"""
+import argparse
+import os
+import statistics
+import time
+from decimal import Decimal
+from typing import Callable, List
+
+DEFAULT_DATABASE_URL = "sqlite:////tmp/budget-bench-balance.db"
+
+
+def measure(fn: Callable[[], object], iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--accounts-per-user", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+    os.environ["BALANCE_SUMMARY_CACHE_TTL_SECONDS"] = "300"
+    os.environ["DATA_VERSION_CACHE_TTL_SECONDS"] = "300"
+
+    from sqlalchemy import event
+
+    from app.core.database import SessionLocal, engine
+    from app.core.migrations import run_migrations
+    from app.services.account import AccountService, balance_summary_cache
+    from benchmarks.seed import SeedConfig, seed_database
+
+    run_migrations(engine)
+    seed_database(engine, SeedConfig(
+        users=args.users, accounts_per_user=args.accounts_per_user, operations_per_user=1000
+    ))
+
+    query_counter = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_query(*_):
+        query_counter[0] += 1
+
+    db = SessionLocal()
+    service = AccountService(db)
+
+    def hydrate() -> Decimal:
+        db.expunge_all()
+        return sum((account.balance for account in service.repo.get_all(1)), Decimal(0))
+
+    def aggregate() -> Decimal:
+        return sum((row.balance for row in service.repo.get_balances_by_currency(1)), Decimal(0))
+
+    def cached() -> Decimal:
+        return sum((balance for _, balance in service.get_balances_by_currency(1)), Decimal(0))
+
+    cases = {"hydrate accounts": hydrate, "SQL aggregate": aggregate, "cached summary": cached}
+    expected = hydrate()
+    balance_summary_cache.clear()
+    print(f"{args.accounts_per_user} accounts per user, {args.iterations} iterations\n")
+    print(f"{'path':<20}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'queries':>9}")
+    for name, fn in cases.items():
+        assert fn() == expected, f"{name}: total differs from the hydrated sum"
+        query_counter[0] = 0
+        timings = sorted(measure(fn, args.iterations))
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(
+            f"{name:<20}{statistics.median(timings):>10.3f}{p95:>10.3f}{statistics.mean(timings):>10.3f}"
+            f"{query_counter[0] / args.iterations:>9.1f}"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict
+
+from sqlalchemy import text, update
+from sqlalchemy.engine import Engine
+
+from app.migrations import m0003_category_monthly_totals
+from app.models import Account, Category, CategoryType, Operation, User
+from app.services.auth import AuthService
+
+BENCH_PASSWORD = "bench-password"
+INSERT_BATCH_SIZE = 5000
+
+
+@dataclass
+class SeedConfig:
+    users: int = 10
+    accounts_per_user: int = 4
+    categories_per_user: int = 12
+    operations_per_user: int = 10000
+    years: int = 3
+    seed: int = 58
+
+
+def _reset_sequences(connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    for table in ("users", "accounts", "categories", "operations"):
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+        ))
+
+
+def seed_database(engine: Engine, config: SeedConfig) -> Dict[str, int]:
+    rng = random.Random(config.seed)
+    hashed_password = asyncio.run(AuthService.get_password_hash(BENCH_PASSWORD))
+    now = datetime.utcnow()
+    history = timedelta(days=365 * config.years)
+
+    with engine.begin() as connection:
+        for table in ("refresh_tokens", "category_monthly_totals", "operations", "categories", "accounts", "users"):
+            connection.execute(text(f"DELETE FROM {table}"))
+
+        connection.execute(User.__table__.insert(), [
+            {
+                "id": user_id,
+                "email": f"bench{user_id}@example.com",
+                "username": f"bench{user_id}",
+                "hashed_password": hashed_password,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user_id in range(1, config.users + 1)
+        ])
+
+        accounts, categories = [], []
+        for user_id in range(1, config.users + 1):
+            for index in range(config.accounts_per_user):
+                accounts.append({
+                    "id": len(accounts) + 1,
+                    "user_id": user_id,
+                    "name": f"Account {index + 1}",
+                    "balance": 0,
+                    "currency": "KGS",
+                    "icon": "wallet",
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            for index in range(config.categories_per_user):
+                categories.append({
+                    "id": len(categories) + 1,
+                    "user_id": user_id,
+                    "name": f"Category {index + 1}",
+                    "type": CategoryType.INCOME if index % 4 == 0 else CategoryType.EXPENSE,
+                    "icon": "tag",
+                    "color": "#888888",
+                    "created_at": now,
+                    "updated_at": now,
+                })
+        connection.execute(Account.__table__.insert(), accounts)
+        connection.execute(Category.__table__.insert(), categories)
+
+        balances: Dict[int, Decimal] = {account["id"]: Decimal(0) for account in accounts}
+        batch = []
+        for user_id in range(1, config.users + 1):
+            user_accounts = accounts[(user_id - 1) * config.accounts_per_user:user_id * config.accounts_per_user]
+            user_categories = categories[(user_id - 1) * config.categories_per_user:user_id * config.categories_per_user]
+            for index in range(config.operations_per_user):
+                account = rng.choice(user_accounts)
+                category = rng.choice(user_categories)
+                amount = Decimal(rng.randint(100, 50000)).scaleb(-2)
+                balances[account["id"]] += amount if category["type"] == CategoryType.INCOME else -amount
+                batch.append({
+                    "user_id": user_id,
+                    "account_id": account["id"],
+                    "category_id": category["id"],
+                    "amount": amount,
+                    "description": f"Synthetic operation {index}",
+                    "operation_date": now - history * rng.random(),
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    connection.execute(Operation.__table__.insert(), batch)
+                    batch = []
+        if batch:
+            connection.execute(Operation.__table__.insert(), batch)
+
+        for account_id, balance in balances.items():
+            connection.execute(update(Account.__table__).where(Account.__table__.c.id == account_id).values(balance=balance))
+        m0003_category_monthly_totals.backfill(connection)
+        _reset_sequences(connection)
+
+    return {
+        "users": config.users,
+        "accounts": len(accounts),
+        "categories": len(categories),
+        "operations": config.users * config.operations_per_user,
+    }
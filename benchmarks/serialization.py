@@ -0,0 +1,135 @@
+"""Compare model-based and row-based serialization of the large list endpoints.
+
+Seeds one user with N operations, then times fetching and encoding the full
+responses of GET /operations/, /operations/details and
+/categories/with-balances both ways: ORM objects -> per-row response models ->
+response_model validation -> stdlib JSON (the generic FastAPI path), and
+column rows -> dicts in one pass -> the fast encoder (orjson when installed).
+
+    python -m benchmarks.serialization --operations 100000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, List
+
+DEFAULT_DATABASE_URL = "sqlite:////tmp/budget-bench-serialization.db"
+
+
+def measure(fn: Callable[[], bytes], iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from app.core import serialization
+    from app.core.database import SessionLocal, engine
+    from app.core.migrations import run_migrations
+    from app.models import Account, Category, Operation
+    from app.schemas.category import CategoryResponse, CategoryWithBalance
+    from app.schemas.operation import OperationResponse, OperationWithDetails
+    from app.services.category import CategoryService
+    from app.services.operation import OperationService
+    from benchmarks.seed import SeedConfig, seed_database
+
+    run_migrations(engine)
+    seed_database(engine, SeedConfig(users=1, operations_per_user=args.operations))
+
+    db = SessionLocal()
+    operation_service = OperationService(db)
+    category_service = CategoryService(db)
+
+    def encode_models(model, items) -> bytes:
+        validated = TypeAdapter(List[model]).validate_python(items)
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    def operations_models() -> bytes:
+        db.expunge_all()
+        operations, _ = operation_service.get_all_operations(1)
+        return encode_models(OperationResponse, operations)
+
+    def operations_rows() -> bytes:
+        return serialization.dumps(operation_service.get_operation_rows(1)[0])
+
+    # The construction used before rows were selected directly: validate the
+    # ORM object, dump it and validate again with the joined columns.
+    def details_models() -> bytes:
+        db.expunge_all()
+        results = (
+            db.query(Operation, Account.name, Category.name, Category.type)
+            .join(Account).join(Category)
+            .filter(Operation.user_id == 1)
+            .order_by(Operation.operation_date.desc(), Operation.id.desc())
+            .all()
+        )
+        return encode_models(OperationWithDetails, [
+            OperationWithDetails(
+                **OperationResponse.model_validate(op).model_dump(),
+                account_name=account_name,
+                category_name=category_name,
+                category_type=category_type.value,
+            )
+            for op, account_name, category_name, category_type in results
+        ])
+
+    def details_rows() -> bytes:
+        return serialization.dumps(operation_service.get_operations_with_details(1)[0])
+
+    def categories_models() -> bytes:
+        db.expunge_all()
+        totals = category_service.total_repo.get_totals(1, None, None)
+        return encode_models(CategoryWithBalance, [
+            CategoryWithBalance(
+                **CategoryResponse.model_validate(category).model_dump(),
+                total_amount=totals.get(category.id, 0),
+            )
+            for category in category_service.repo.get_all(1)
+        ])
+
+    def categories_rows() -> bytes:
+        return serialization.dumps(category_service.get_categories_with_balances(1))
+
+    cases = {
+        "GET /operations/": (operations_models, operations_rows),
+        "GET /operations/details": (details_models, details_rows),
+        "GET /categories/with-balances": (categories_models, categories_rows),
+    }
+
+    encoder = "orjson" if serialization.orjson is not None else "stdlib json"
+    print(f"{args.operations} operations, {args.iterations} iterations, fast encoder: {encoder}\n")
+    print(f"{'route':<32}{'path':<8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'speedup':>9}")
+    for route, (models_path, rows_path) in cases.items():
+        assert json.loads(models_path()) == json.loads(rows_path()), f"{route}: paths produce different JSON"
+        means = {}
+        for name, fn in (("models", models_path), ("rows", rows_path)):
+            timings = sorted(measure(fn, args.iterations))
+            means[name] = statistics.mean(timings)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            speedup = f"{means['models'] / means['rows']:.1f}x" if name == "rows" else ""
+            print(f"{route:<32}{name:<8}{statistics.median(timings):>10.2f}{p95:>10.2f}{means[name]:>10.2f}{speedup:>9}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()